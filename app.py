@@ -2,7 +2,10 @@
 import streamlit as st
 import pandas as pd
 from datetime import date
-from calculos import calcular_igpm_puro, calcular_conforme_cda, calcular_pratica_real
+from io import BytesIO
+from calculos import (
+    calcular_tres_metodos, carregar_tabela_fatores, corrigir_contas, formatar_brasileiro, ler_contas, versao_arquivo,
+)
 
 st.set_page_config(
     page_title="Comparador SEMAE - Valores Justos",
@@ -10,6 +13,24 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
+# ----------------------------
+# Cache: um índice carregado por processo e resultados memorizados
+# ----------------------------
+@st.cache_resource(max_entries=2)
+def carregar_motor(versao_indice):
+    """Tabela de fatores compartilhada por todas as sessões; recarrega se o indice.csv mudar."""
+    return carregar_tabela_fatores()  # cache binário: sem o pandas ler o indice.csv
+
+@st.cache_data(max_entries=10_000)
+def calcular_tres_cenarios(valor_original, data_vencimento, data_fim_str, versao_indice):
+    return calcular_tres_metodos(valor_original, data_vencimento, data_fim_str, carregar_motor(versao_indice))
+
+@st.cache_data(max_entries=32)
+def corrigir_lista(conteudo, data_fim_str, versao_indice):
+    """Os três métodos para todas as faturas de um CSV enviado (cálculo vetorizado)."""
+    contas = ler_contas(BytesIO(conteudo)).dropna(subset=["vencimento", "valor"])
+    return corrigir_contas(contas, data_fim_str, tabela=carregar_motor(versao_indice))
+
 st.title("⚖️ Comparador de Débitos da SEMAE (São Leopoldo/RS)")
 st.markdown("""
 Ferramenta pública para comparar **três formas de cálculo** de débitos de água/esgoto:
@@ -34,10 +55,10 @@ if st.button("🔍 Calcular os três cenários"):
     if valor_original <= 0:
         st.error("Por favor, informe um valor maior que zero.")
     else:
-        # Executar os três cálculos
-        val_justo = calcular_igpm_puro(valor_original, pd.to_datetime(data_vencimento), data_fim_str)
-        val_cda = calcular_conforme_cda(valor_original, pd.to_datetime(data_vencimento), data_fim_str)
-        val_real = calcular_pratica_real(valor_original, pd.to_datetime(data_vencimento), data_fim_str)
+        # Executar os três cálculos (memorizados por valor, vencimento, data final e versão do índice)
+        val_justo, val_cda, val_real = calcular_tres_cenarios(
+            valor_original, data_vencimento, data_fim_str, versao_arquivo()
+        )
 
         # Exibir resultados
         st.subheader("📊 Resultados da comparação")
@@ -71,5 +92,34 @@ if st.button("🔍 Calcular os três cenários"):
               → Reproduz o demonstrativo oficial (`cda.csv`).
             """)
 
+st.divider()
+
+# Lista de faturas
+st.subheader("📂 Várias faturas de uma vez")
+arquivo = st.file_uploader(
+    "Envie um CSV no formato do CONTASFORMATADAS.csv (competencia, tipo, vencimento, valor)",
+    type="csv"
+)
+if arquivo is not None:
+    try:
+        df_lista = corrigir_lista(arquivo.getvalue(), data_fim_str, versao_arquivo())
+    except Exception as e:
+        st.error(f"Não foi possível ler o arquivo: {e}")
+    else:
+        if df_lista.empty:
+            st.warning("Nenhuma fatura válida encontrada no arquivo.")
+        else:
+            c1, c2, c3 = st.columns(3)
+            c1.metric("Valor justo (IGP-M)", f"R$ {df_lista['igpm_puro'].sum():,.2f}")
+            c2.metric("Conforme CDA", f"R$ {df_lista['conforme_cda'].sum():,.2f}")
+            c3.metric("Prática real", f"R$ {df_lista['pratica_real'].sum():,.2f}")
+            st.dataframe(df_lista, use_container_width=True, hide_index=True)
+            st.download_button(
+                "⬇️ Baixar resultado (CSV)",
+                formatar_brasileiro(df_lista).to_csv(index=False, sep=";").encode("utf-8"),
+                file_name="faturas_corrigidas.csv",
+                mime="text/csv"
+            )
+
 st.divider()
 st.caption("Esta ferramenta é gratuita, sem fins lucrativos e destinada à transparência e resolução extrajudicial de débitos.")
@@ -0,0 +1,209 @@
+# benchmark_calculos.py
+# Mede a velocidade dos motores de cálculo em arquivos sintéticos no formato
+# do CONTASFORMATADAS.csv e guarda os resultados para comparar versões.
+#
+#   python benchmark_calculos.py --tamanhos 1000,100000,10000000
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+import calculos
+import semae_cli
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTADOS_PATH = os.path.join(SCRIPT_DIR, "benchmark_resultados.jsonl")
+DATA_FIM = "09/2025"
+MAX_LINHAS_ESCALAR = 5_000        # o caminho linha a linha é medido numa amostra
+MAX_LINHAS_DEMONSTRATIVO = 20_000 # ~70 linhas de demonstrativo por conta: ~1,4 milhão de linhas
+
+# ----------------------------
+# Dados sintéticos
+# ----------------------------
+def gerar_arquivo_sintetico(caminho, n_linhas, semente=0, tamanho_bloco=1_000_000):
+    """Grava n_linhas faturas com o mesmo layout e formatação do CONTASFORMATADAS.csv."""
+    rng = np.random.default_rng(semente)
+    with open(caminho, "w", encoding="utf-8", newline="") as f:
+        f.write("competencia,tipo,vencimento,valor\n")
+        for inicio in range(0, n_linhas, tamanho_bloco):
+            n = min(tamanho_bloco, n_linhas - inicio)
+            competencia = pd.Series(pd.PeriodIndex.from_ordinals(
+                rng.integers(pd.Period("2014-01", "M").ordinal, pd.Period("2025-08", "M").ordinal + 1, n), freq="M"
+            ))
+            vencimento = (competencia + 1).dt.start_time + pd.to_timedelta(rng.integers(4, 25, n), unit="D")
+            centavos = pd.Series(rng.integers(1_000, 500_000, n))
+            reais = centavos // 100
+            texto_reais = (reais % 1000).astype(str)
+            milhar = reais >= 1000
+            texto_reais[milhar] = (reais[milhar] // 1000).astype(str) + "." + texto_reais[milhar].str.zfill(3)
+            bloco = pd.DataFrame({
+                "competencia": competencia.dt.strftime("%m/%Y"),
+                "tipo": "FATURA",
+                "vencimento": vencimento.dt.strftime("%d/%m/%Y"),
+                "valor": texto_reais + "," + (centavos % 100).astype(str).str.zfill(2),
+            })
+            bloco.to_csv(f, index=False, header=False)
+
+# ----------------------------
+# Casos medidos
+# ----------------------------
+def _caso_escalar(contas):
+    amostra = contas.iloc[:MAX_LINHAS_ESCALAR]
+    for valor, venc in zip(amostra["valor"], amostra["vencimento"]):
+        calculos.calcular_igpm_puro(valor, venc, DATA_FIM)
+        calculos.calcular_conforme_cda(valor, venc, DATA_FIM)
+        calculos.calcular_pratica_real(valor, venc, DATA_FIM)
+    return len(amostra)
+
+def _caso_lote(contas):
+    calculos.calcular_lote(contas["valor"], contas["vencimento"], DATA_FIM)
+    return len(contas)
+
+def _caso_processar_contas(contas):
+    tabela = calculos.carregar_tabela_fatores()
+    calculos.processar_contas_colunar(contas, tabela, pd.Timestamp("2025-09-30"), "real")
+    return len(contas)
+
+def _caso_centavos(contas):
+    tabela = calculos.carregar_tabela_fatores()
+    calculos.processar_contas_centavos(contas, tabela, pd.Timestamp("2025-09-30"), "real")
+    return len(contas)
+
+def _caso_demonstrativo(contas):
+    igpm, _ = calculos.carregar_indice()
+    amostra = contas.iloc[:MAX_LINHAS_DEMONSTRATIVO]
+    calculos.gerar_demonstrativos(amostra, igpm[["fator"]], DATA_FIM)
+    return len(amostra)
+
+CASOS_EM_MEMORIA = {
+    "escalar": _caso_escalar,
+    "lote": _caso_lote,
+    "processar_contas": _caso_processar_contas,
+    "centavos": _caso_centavos,
+    "demonstrativo": _caso_demonstrativo,
+}
+
+def _caso_streaming(caminho):
+    with open(os.devnull, "w", encoding="utf-8") as destino:
+        return semae_cli.corrigir_arquivo(caminho, destino, DATA_FIM)
+
+# ----------------------------
+# Medição
+# ----------------------------
+def medir(funcao, argumento, repeticoes):
+    """Melhor tempo de `repeticoes` execuções e pico de memória (tracemalloc) de uma execução à parte."""
+    melhor = float("inf")
+    linhas = 0
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        linhas = funcao(argumento)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    tracemalloc.start()
+    try:
+        funcao(argumento)
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "linhas": linhas,
+        "segundos": melhor,
+        "linhas_por_segundo": linhas / melhor if melhor > 0 else float("inf"),
+        "pico_memoria_mb": pico / 2**20,
+    }
+
+def versao_codigo():
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"], cwd=SCRIPT_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "desconhecida"
+
+def executar(tamanhos, casos, repeticoes, pasta):
+    versao = versao_codigo()
+    resultados = []
+    for n in tamanhos:
+        caminho = os.path.join(pasta, f"contas_{n}.csv")
+        gerar_arquivo_sintetico(caminho, n)
+        contas = None
+        for caso in casos:
+            if caso == "streaming":
+                medida = medir(_caso_streaming, caminho, repeticoes)
+            else:
+                if contas is None:
+                    contas = calculos.carregar_contas(caminho).dropna(subset=["vencimento", "valor"])
+                medida = medir(CASOS_EM_MEMORIA[caso], contas, repeticoes)
+            resultado = {
+                "data": datetime.now().isoformat(timespec="seconds"),
+                "versao": versao,
+                "python": platform.python_version(),
+                "pandas": pd.__version__,
+                "caso": caso,
+                "tamanho": n,
+                **medida,
+            }
+            resultados.append(resultado)
+            print(f"{caso:>17} {n:>10} linhas: {medida['linhas_por_segundo']:>14,.0f} linhas/s  "
+                  f"{medida['segundos']:.4f} s  pico {medida['pico_memoria_mb']:.1f} MB")
+    return resultados
+
+# ----------------------------
+# Histórico
+# ----------------------------
+def carregar_historico(caminho):
+    if not os.path.exists(caminho):
+        return []
+    with open(caminho, encoding="utf-8") as f:
+        return [json.loads(linha) for linha in f if linha.strip()]
+
+def comparar(resultados, historico):
+    """Compara cada caso com a última medição de outra versão do código."""
+    for r in resultados:
+        anteriores = [h for h in historico
+                      if h["caso"] == r["caso"] and h["tamanho"] == r["tamanho"] and h["versao"] != r["versao"]]
+        if not anteriores:
+            continue
+        ant = anteriores[-1]
+        razao = r["linhas_por_segundo"] / ant["linhas_por_segundo"]
+        print(f"{r['caso']:>17} {r['tamanho']:>10} linhas: {razao:5.2f}x em relação a {ant['versao']}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark dos motores de cálculo.")
+    parser.add_argument("--tamanhos", default="1000,100000",
+                        help="tamanhos dos arquivos sintéticos, separados por vírgula (ex.: 1000,100000,10000000)")
+    parser.add_argument("--casos", default=",".join(list(CASOS_EM_MEMORIA) + ["streaming"]),
+                        help="casos a medir, separados por vírgula")
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--resultados", default=RESULTADOS_PATH,
+                        help="arquivo JSON Lines onde os resultados são acrescentados")
+    parser.add_argument("--nao-salvar", action="store_true", help="só mostra, sem gravar os resultados")
+    args = parser.parse_args(argv)
+
+    tamanhos = [int(t) for t in args.tamanhos.split(",")]
+    casos = args.casos.split(",")
+    desconhecidos = set(casos) - set(CASOS_EM_MEMORIA) - {"streaming"}
+    if desconhecidos:
+        parser.error(f"casos desconhecidos: {', '.join(sorted(desconhecidos))}")
+
+    with tempfile.TemporaryDirectory() as pasta:
+        resultados = executar(tamanhos, casos, args.repeticoes, pasta)
+
+    comparar(resultados, carregar_historico(args.resultados))
+    if not args.nao_salvar:
+        with open(args.resultados, "a", encoding="utf-8") as f:
+            for r in resultados:
+                f.write(json.dumps(r, ensure_ascii=False) + "\n")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
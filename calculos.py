@@ -134,82 +134,1011 @@ def calcular_igpm_puro(valor_original, data_vencimento, data_fim_str="09/2025"):
 
     return round(valor_original * fator_acum, 2)
 '''
-import pandas as pd
+# pandas e numpy são importados dentro das funções que os usam: o cálculo de
+# uma fatura (calcular_igpm_puro e afins) roda só com a biblioteca padrão.
+import csv
+import math
 import os
+import struct
+import sys
+import threading
+from array import array
+from functools import lru_cache
 
-def carregar_dados():
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    contas_path = os.path.join(script_dir, "CONTASFORMATADAS.csv")
-    indices_path = os.path.join(script_dir, "indice.csv")
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+CONTAS_PATH = os.path.join(SCRIPT_DIR, "CONTASFORMATADAS.csv")
+INDICE_PATH = os.path.join(SCRIPT_DIR, "indice.csv")
 
-    contas = pd.read_csv(
-        contas_path,
-        sep=",",
-        quotechar='"',
-        decimal=",",
-        dtype={"competencia": str, "tipo": str}
-    )
+TAXA_MULTA = 0.02               # 2%
+TAXA_JUROS_DECLARADA = 0.000167 # 0,0167% ao mês (texto da CDA)
+TAXA_JUROS_REAL = 0.002345      # 0,2345% ao mês (calibrado com cda.csv)
+
+# ----------------------------
+# Leitura dos arquivos (com cache por processo)
+# ----------------------------
+_cache_arquivos = {}
+_trava_cache = threading.Lock()
+
+def _ler_com_cache(caminho, leitor):
+    """
+    Devolve leitor(caminho), relendo o arquivo só quando mtime ou tamanho mudam.
+
+    O resultado é compartilhado entre chamadas (e entre sessões do Streamlit):
+    quem recebe os DataFrames não deve alterá-los no lugar.
+    """
+    assinatura = versao_arquivo(caminho)
+    chave = (os.path.abspath(caminho), leitor)
+    with _trava_cache:
+        item = _cache_arquivos.get(chave)
+    if item is not None and item[0] == assinatura:
+        return item[1]
+    valor = leitor(caminho)
+    with _trava_cache:
+        _cache_arquivos[chave] = (assinatura, valor)
+    return valor
+
+def limpar_contas(contas):
+    """Descarta linhas inválidas e converte valor e vencimento de um bloco bruto."""
+    import pandas as pd
     contas = contas.dropna(subset=["competencia", "vencimento", "valor"])
+    # Remove linhas espúrias (ex.: total "3.308,39" no final do arquivo)
+    contas = contas[contas["competencia"].str.match(r"\d{2}/\d{4}", na=False)]
     contas["valor"] = pd.to_numeric(
-        contas["valor"].astype(str).str.replace(".", "").str.replace(",", "."),
+        contas["valor"].astype(str).str.replace(".", "", regex=False).str.replace(",", ".", regex=False),
         errors="coerce"
     )
     contas["vencimento"] = pd.to_datetime(contas["vencimento"], dayfirst=True, errors="coerce")
+    return contas
 
-    igpm = pd.read_csv(indices_path, sep=",", quotechar='"', decimal=",")
+def _ler_contas(caminho, **kwargs):
+    import pandas as pd
+    return pd.read_csv(
+        caminho,
+        sep=",",
+        quotechar='"',
+        dtype={"competencia": str, "tipo": str, "vencimento": str, "valor": str},
+        **kwargs
+    )
+
+def ler_contas(arquivo):
+    """Lê e limpa contas de um caminho ou arquivo aberto (ex.: upload), sem cache."""
+    return limpar_contas(_ler_contas(arquivo))
+
+def ler_contas_em_blocos(caminho=CONTAS_PATH, tamanho_bloco=100_000, limpar=True):
+    """
+    Lê o arquivo de contas em blocos, sem carregar tudo na memória.
+
+    Com limpar=False os blocos vêm como texto bruto, para serem limpos
+    depois (por exemplo, em outro processo) com limpar_contas.
+    """
+    for bloco in _ler_contas(caminho, chunksize=tamanho_bloco):
+        yield limpar_contas(bloco) if limpar else bloco
+
+def compactar_contas(contas):
+    """
+    Contas limpas na forma compacta, para carteiras com milhões de faturas.
+
+    competencia vira o ordinal ano*12+mês (int16), tipo vira categórico e o
+    valor passa a valor_centavos (int64); vencimento continua datetime64.
+    Só ficam as contas com vencimento e valor. corrigir_contas e os motores
+    colunares aceitam tanto esta forma quanto a de ler_contas.
+    """
+    import numpy as np
+    import pandas as pd
+    contas = contas.dropna(subset=["vencimento", "valor"])
+    competencia = contas["competencia"].astype(str)
+    return pd.DataFrame({
+        "competencia": (competencia.str.slice(3, 7).astype(np.int16) * 12
+                        + competencia.str.slice(0, 2).astype(np.int16)).astype(np.int16),
+        "tipo": contas["tipo"].astype("category"),
+        "vencimento": contas["vencimento"],
+        "valor_centavos": para_centavos(contas["valor"]),
+    }, index=contas.index)
+
+def ler_contas_compactas(arquivo=CONTAS_PATH, tamanho_bloco=100_000):
+    """
+    Lê o arquivo de contas bloco a bloco já na forma compacta.
+
+    Cada bloco é compactado antes do próximo ser lido, então as strings do
+    CSV nunca ficam todas na memória ao mesmo tempo.
+    """
+    import pandas as pd
+    from pandas.api.types import union_categoricals
+    blocos = [compactar_contas(bloco) for bloco in ler_contas_em_blocos(arquivo, tamanho_bloco)]
+    if not blocos:
+        return compactar_contas(ler_contas(arquivo))
+    tipos = union_categoricals([bloco["tipo"] for bloco in blocos])
+    contas = pd.concat([bloco.drop(columns="tipo") for bloco in blocos], ignore_index=True)
+    contas.insert(1, "tipo", pd.Categorical(tipos))
+    return contas
+
+def valores_em_reais(contas):
+    """Valores das contas em reais (float), na forma comum ou compacta."""
+    if "valor_centavos" in contas:
+        return contas["valor_centavos"].to_numpy() / 100
+    return contas["valor"].to_numpy(dtype=float)
+
+def valores_em_centavos(contas):
+    """Valores das contas em centavos (int64), na forma comum ou compacta."""
+    if "valor_centavos" in contas:
+        return contas["valor_centavos"].to_numpy()
+    return para_centavos(contas["valor"])
+
+def _ler_tabela_indice(caminho):
+    """TabelaFatores direto do CSV, só com a biblioteca padrão."""
+    fatores = {}
+    with open(caminho, encoding="utf-8-sig", newline="") as f:
+        for linha in csv.DictReader(f):
+            if not linha.get("Data") or not linha.get("Indice"):
+                continue
+            mes, ano = linha["Data"].split("/")
+            fatores[int(ano) * 12 + int(mes)] = 1 + float(linha["Indice"].replace(",", ".")) / 100.0
+    if not fatores:
+        return TabelaFatores(0, [])
+    inicio = min(fatores)
+    return TabelaFatores(inicio, [fatores.get(o, 1.0) for o in range(inicio, max(fatores) + 1)])
+
+# Cache binário do índice, gravado ao lado do CSV (indice.csv -> indice.fatores):
+# cabeçalho fixo com a assinatura do CSV de origem e o ordinal do primeiro mês,
+# seguido dos produtos acumulados em float64 little-endian. Os meses são
+# contíguos, então o ordinal de cada posição é ordinal_inicial + i. O arquivo
+# também pode ser mapeado com numpy.memmap(..., offset=_CABECALHO_COMPILADO.size).
+_MAGICO_COMPILADO = b"SEMAEFT1"
+_CABECALHO_COMPILADO = struct.Struct("<8sqqqq")  # mágico, mtime_ns, tamanho, ordinal, n
+
+def caminho_indice_compilado(caminho=INDICE_PATH):
+    return os.path.splitext(caminho)[0] + ".fatores"
+
+def _ler_indice_compilado(caminho_compilado, assinatura):
+    """TabelaFatores do cache binário, ou None se faltar ou não for do CSV atual."""
+    try:
+        with open(caminho_compilado, "rb") as f:
+            cabecalho = f.read(_CABECALHO_COMPILADO.size)
+            if len(cabecalho) != _CABECALHO_COMPILADO.size:
+                return None
+            magico, mtime_ns, tamanho, ordinal_inicial, n = _CABECALHO_COMPILADO.unpack(cabecalho)
+            if magico != _MAGICO_COMPILADO or (mtime_ns, tamanho) != assinatura:
+                return None
+            acumulado = array("d")
+            acumulado.fromfile(f, n)
+    except (OSError, EOFError):
+        return None
+    if sys.byteorder == "big":
+        acumulado.byteswap()
+    return TabelaFatores.de_acumulado(ordinal_inicial, acumulado.tolist())
+
+def _gravar_indice_compilado(caminho_compilado, assinatura, tabela):
+    acumulado = array("d", tabela.acumulado)
+    if sys.byteorder == "big":
+        acumulado.byteswap()
+    temporario = f"{caminho_compilado}.{os.getpid()}.tmp"
+    try:
+        with open(temporario, "wb") as f:
+            f.write(_CABECALHO_COMPILADO.pack(_MAGICO_COMPILADO, *assinatura, tabela.ordinal_inicial, len(acumulado)))
+            acumulado.tofile(f)
+        os.replace(temporario, caminho_compilado)  # leitores nunca veem o arquivo pela metade
+    except OSError:
+        # pasta sem permissão de escrita: segue só com a tabela em memória
+        try:
+            os.remove(temporario)
+        except OSError:
+            pass
+
+def _ler_tabela_indice_compilada(caminho):
+    """
+    TabelaFatores pelo cache binário; recompila a partir do CSV quando ele muda.
+
+    A validade é conferida pela assinatura (mtime, tamanho) do CSV gravada no
+    cabeçalho, então editar o indice.csv basta para o cache ser refeito.
+    """
+    assinatura = versao_arquivo(caminho)
+    caminho_compilado = caminho_indice_compilado(caminho)
+    tabela = _ler_indice_compilado(caminho_compilado, assinatura)
+    if tabela is None:
+        tabela = _ler_tabela_indice(caminho)
+        _gravar_indice_compilado(caminho_compilado, assinatura, tabela)
+    return tabela
+
+def acrescentar_mes_indice(mes_str, indice_pct, caminho=INDICE_PATH):
+    """
+    Acrescenta ao CSV do índice o mês seguinte ao último, como publicado pela FGV.
+
+    indice_pct é a variação do mês em % (número ou texto com vírgula decimal).
+    A TabelaFatores em uso ganha uma posição (TabelaFatores.estender) e o cache
+    binário é regravado a partir dela, sem reler a série. Retorna a nova tabela.
+    """
+    tabela = carregar_tabela_fatores(caminho)
+    ordinal = ordinal_mes_fim(mes_str)
+    if tabela.acumulado[1:] and ordinal != tabela.ordinal_final + 1:
+        raise ValueError(f"O próximo mês do índice é {ordinal_mes_texto(tabela.ordinal_final + 1)}.")
+    texto = str(indice_pct).strip().replace(".", ",")
+    fator = 1 + float(texto.replace(",", ".")) / 100.0  # mesma conversão de _ler_tabela_indice
+    with open(caminho, "rb+") as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell():
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+        f.write(f'{ordinal_mes_texto(ordinal)},"{texto}"\n'.encode("utf-8"))
+    nova = tabela.estender(fator) if tabela.acumulado[1:] else TabelaFatores(ordinal, [fator])
+    _gravar_indice_compilado(caminho_indice_compilado(caminho), versao_arquivo(caminho), nova)
+    return nova
+
+def _ler_indice(caminho):
+    import pandas as pd
+    igpm = pd.read_csv(caminho, sep=",", quotechar='"', decimal=",")
     igpm["Data"] = pd.to_datetime(igpm["Data"], format="%m/%Y")
     igpm = igpm.set_index("Data").sort_index()
     igpm["fator"] = 1 + igpm["Indice"] / 100.0
+    return igpm, carregar_tabela_fatores(caminho)
 
-    return contas, igpm
+def versao_arquivo(caminho=INDICE_PATH):
+    """Assinatura (mtime, tamanho) usada pelo cache; muda quando o arquivo muda."""
+    info = os.stat(caminho)
+    return info.st_mtime_ns, info.st_size
 
-def calcular_igpm_puro(valor_original, data_vencimento, data_fim_str="09/2025"):
-    if pd.isna(valor_original) or pd.isna(data_vencimento):
-        return valor_original
-    _, igpm = carregar_dados()
+def carregar_contas(caminho=CONTAS_PATH):
+    """Contas do CONTASFORMATADAS.csv, lidas uma vez por versão do arquivo."""
+    return _ler_com_cache(caminho, ler_contas)
+
+def carregar_contas_compactas(caminho=CONTAS_PATH):
+    """Contas na forma compacta (compactar_contas), lidas uma vez por versão do arquivo."""
+    return _ler_com_cache(caminho, ler_contas_compactas)
+
+def carregar_tabela_fatores(caminho=INDICE_PATH):
+    """Só a TabelaFatores do indice.csv, via cache binário (não importa pandas)."""
+    return _ler_com_cache(caminho, _ler_tabela_indice_compilada)
+
+def carregar_indice(caminho=INDICE_PATH):
+    """(igpm, TabelaFatores) do indice.csv, lidos uma vez por versão do arquivo."""
+    return _ler_com_cache(caminho, _ler_indice)
+
+def carregar_dados():
+    """Carrega CONTASFORMATADAS.csv e indice.csv da raiz do projeto (com cache)."""
+    igpm, _ = carregar_indice()
+    return carregar_contas(), igpm
+
+# ----------------------------
+# Índices de correção
+# ----------------------------
+# Nome -> CSV no mesmo formato do indice.csv ("Data" MM/AAAA e "Indice" em %
+# ao mês, com vírgula decimal). Cada série é compilada na mesma TabelaFatores
+# (e no mesmo cache binário) que o IGP-M. A SELIC e a TR entram como fatores
+# mensais compostos, do mesmo jeito que os demais índices.
+INDICES = {
+    "igpm": INDICE_PATH,
+    "ipca": os.path.join(SCRIPT_DIR, "indices", "ipca.csv"),
+    "inpc": os.path.join(SCRIPT_DIR, "indices", "inpc.csv"),
+    "selic": os.path.join(SCRIPT_DIR, "indices", "selic.csv"),
+    "tr": os.path.join(SCRIPT_DIR, "indices", "tr.csv"),
+}
+
+def registrar_indice(nome, caminho):
+    """Inclui (ou troca) um índice no registro, a partir de um CSV."""
+    INDICES[nome] = caminho
+
+def indices_disponiveis():
+    """Nomes dos índices registrados cujo CSV existe."""
+    return [nome for nome, caminho in INDICES.items() if os.path.exists(caminho)]
+
+def carregar_tabela_indice(nome="igpm"):
+    """
+    TabelaFatores de um índice do registro, com o mesmo cache do indice.csv.
+
+    ValueError se o nome não estiver registrado ou se o CSV dele não existir
+    (a mensagem não traz o caminho, que pode ir parar numa resposta da API).
+    """
+    if nome not in INDICES:
+        raise ValueError(f"Índice desconhecido: {nome}. Use um de: {', '.join(INDICES)}.")
+    if not os.path.exists(INDICES[nome]):
+        raise ValueError(f"Índice indisponível: {nome} (arquivo não encontrado). "
+                         f"Disponíveis: {', '.join(indices_disponiveis()) or 'nenhum'}.")
+    return carregar_tabela_fatores(INDICES[nome])
+
+# ----------------------------
+# Fatores acumulados
+# ----------------------------
+def ordinal_mes(periodo):
+    """Converte um mês (Period, Timestamp ou date) no inteiro ano*12+mês."""
+    return periodo.year * 12 + periodo.month
+
+class TabelaFatores:
+    """
+    Produtos acumulados (prefixos) dos fatores mensais de um índice.
+
+    acumulado[i] é o produto dos i primeiros fatores da série, de modo que o
+    fator de qualquer intervalo de meses é a razão entre duas posições.
+    Meses fora da série contam como fator 1, como no fatiamento por datas.
+    A tabela é uma lista simples; o array NumPy só é criado no uso vetorizado.
+    """
+    def __init__(self, ordinal_inicial, fatores):
+        self.ordinal_inicial = int(ordinal_inicial)
+        acumulado = [1.0]
+        for fator in fatores:
+            acumulado.append(acumulado[-1] * float(fator))
+        self.acumulado = acumulado
+        self.ordinal_final = self.ordinal_inicial + len(acumulado) - 2
+        self._acumulado_array = None
+
+    @classmethod
+    def de_acumulado(cls, ordinal_inicial, acumulado):
+        """Reconstrói a tabela a partir dos produtos acumulados já calculados."""
+        tabela = cls(ordinal_inicial, [])
+        tabela.acumulado = list(acumulado)
+        tabela.ordinal_final = tabela.ordinal_inicial + len(tabela.acumulado) - 2
+        return tabela
+
+    def estender(self, fator):
+        """Nova tabela com mais um mês no fim; só um produto, sem recalcular a série."""
+        return TabelaFatores.de_acumulado(self.ordinal_inicial, self.acumulado + [self.acumulado[-1] * float(fator)])
+
+    def _posicao(self, ordinal):
+        return min(max(ordinal - self.ordinal_inicial, 0), len(self.acumulado) - 1)
+
+    def fator_periodo(self, ordinal_inicio, ordinal_fim):
+        """Fator acumulado de ordinal_inicio até ordinal_fim (inclusive)."""
+        if ordinal_inicio > ordinal_fim:
+            return 1.0
+        return self.acumulado[self._posicao(ordinal_fim + 1)] / self.acumulado[self._posicao(ordinal_inicio)]
+
+    def fatores_periodo(self, ordinais_inicio, ordinais_fim):
+        """Versão vetorizada de fator_periodo para arrays de ordinais."""
+        import numpy as np
+        if self._acumulado_array is None:
+            self._acumulado_array = np.array(self.acumulado, dtype=float)
+        acumulado = self._acumulado_array
+        ordinais_inicio = np.asarray(ordinais_inicio, dtype=np.int64)
+        ordinais_fim = np.asarray(ordinais_fim, dtype=np.int64)
+        ultimo = len(acumulado) - 1
+        i = np.clip(ordinais_inicio - self.ordinal_inicial, 0, ultimo)
+        j = np.clip(ordinais_fim + 1 - self.ordinal_inicial, 0, ultimo)
+        return np.where(ordinais_inicio <= ordinais_fim, acumulado[j] / acumulado[i], 1.0)
+
+def construir_tabela_fatores(igpm):
+    """Monta a TabelaFatores a partir do DataFrame de índices (coluna "fator")."""
+    import numpy as np
+    ordinais = np.asarray(igpm.index.year * 12 + igpm.index.month, dtype=np.int64)
+    if len(ordinais) == 0:
+        return TabelaFatores(0, [])
+    inicio = int(ordinais.min())
+    fatores = np.ones(int(ordinais.max()) - inicio + 1)
+    fatores[ordinais - inicio] = igpm["fator"].to_numpy(dtype=float)
+    return TabelaFatores(inicio, fatores)
+
+def ordinais_mes(datas):
+    """Ordinais ano*12+mês de uma coluna de datas; posições NaT recebem 0."""
+    import numpy as np
+    import pandas as pd
+    datas = pd.DatetimeIndex(pd.to_datetime(datas))
+    validas = ~datas.isna()
+    ordinais = np.zeros(len(datas), dtype=np.int64)
+    ordinais[validas] = datas.year[validas] * 12 + datas.month[validas]
+    return ordinais
+
+@lru_cache(maxsize=256)
+def ordinal_mes_fim(data_fim_str):
+    """Ordinal do mês final "MM/AAAA"; ValueError se o formato for inválido."""
     try:
-        mes_fim = pd.Period(data_fim_str, freq="M")
-    except:
+        mes, ano = (int(parte) for parte in str(data_fim_str).strip().split("/"))
+    except ValueError:
         raise ValueError("Formato de data final inválido. Use MM/AAAA.")
-    mes_inicio = data_vencimento.to_period("M") + 1
+    if not 1 <= mes <= 12:
+        raise ValueError("Formato de data final inválido. Use MM/AAAA.")
+    return ano * 12 + mes
+
+def ordinal_mes_texto(ordinal):
+    """Inverso de ordinal_mes_fim: ordinal -> "MM/AAAA"."""
+    return f"{(ordinal - 1) % 12 + 1:02d}/{(ordinal - 1) // 12}"
+
+def _ausente(valor):
+    # None, NaN e NaT; os dois últimos são diferentes de si mesmos
+    return valor is None or valor != valor
+
+# ----------------------------
+# Cálculo de uma fatura (sem pandas)
+# ----------------------------
+# Tudo em inteiros ano*12+mês e numa lista de produtos acumulados: nenhum
+# Period/Timestamp é criado, então cada chamada custa poucos microssegundos.
+def arredondar_centavos(valor):
+    """
+    Arredonda ao centavo como np.round(valor, 2): valor*100 vai ao inteiro mais
+    próximo, com empate para o par.
+
+    É a regra do cálculo original (round sobre o np.float64 de fatores.prod()).
+    Vale igual para um número (sem numpy) e para um array, então o cálculo de
+    uma fatura e o em lote dão o mesmo centavo nos empates. Infinito e NaN
+    voltam como estão, também como no np.round.
+    """
+    if isinstance(valor, (int, float)):
+        if not math.isfinite(valor):
+            return valor
+        return round(valor * 100) / 100
+    import numpy as np
+    return np.round(valor, 2)
+
+def _meses_correcao(data_vencimento, data_fim_str):
+    """(mês inicial, mês final) da correção: do mês seguinte ao vencimento até o mês final."""
+    return ordinal_mes(data_vencimento) + 1, ordinal_mes_fim(data_fim_str)
+
+def calcular_igpm_puro(valor_original, data_vencimento, data_fim_str="09/2025", tabela=None):
+    if _ausente(valor_original) or _ausente(data_vencimento):
+        return valor_original
+    tabela = tabela or carregar_tabela_fatores()
+    mes_inicio, mes_fim = _meses_correcao(data_vencimento, data_fim_str)
     if mes_inicio > mes_fim:
         return valor_original
-    dt_inicio = mes_inicio.start_time
-    dt_fim = mes_fim.end_time
-    fatores = igpm.loc[dt_inicio:dt_fim, "fator"]
-    fator_acum = fatores.prod() if not fatores.empty else 1.0
-    return round(valor_original * fator_acum, 2)
+    return arredondar_centavos(valor_original * tabela.fator_periodo(mes_inicio, mes_fim))
 
 def calcular_conforme_cda(valor_original, data_vencimento, data_fim_str="09/2025"):
-    if pd.isna(valor_original) or pd.isna(data_vencimento):
+    if _ausente(valor_original) or _ausente(data_vencimento):
         return valor_original
-    try:
-        mes_fim = pd.Period(data_fim_str, freq="M")
-    except:
-        raise ValueError("Formato de data final inválido. Use MM/AAAA.")
-    mes_inicio = data_vencimento.to_period("M") + 1
-    if mes_inicio > mes_fim:
-        meses = 0
-    else:
-        meses = (mes_fim - mes_inicio).n + 1
-    multa = valor_original * 0.02
-    juros = valor_original * 0.000167 * meses
-    return round(valor_original + multa + juros, 2)
+    mes_inicio, mes_fim = _meses_correcao(data_vencimento, data_fim_str)
+    meses = max(0, mes_fim - mes_inicio + 1)
+    multa = valor_original * TAXA_MULTA
+    juros = valor_original * TAXA_JUROS_DECLARADA * meses
+    return arredondar_centavos(valor_original + multa + juros)
 
-def calcular_pratica_real(valor_original, data_vencimento, data_fim_str="09/2025"):
-    if pd.isna(valor_original) or pd.isna(data_vencimento):
+def calcular_pratica_real(valor_original, data_vencimento, data_fim_str="09/2025", tabela=None):
+    if _ausente(valor_original) or _ausente(data_vencimento):
         return valor_original
-    valor_corrigido = calcular_igpm_puro(valor_original, data_vencimento, data_fim_str)
-    multa = valor_corrigido * 0.02
+    valor_corrigido = calcular_igpm_puro(valor_original, data_vencimento, data_fim_str, tabela)
+    mes_inicio, mes_fim = _meses_correcao(data_vencimento, data_fim_str)
+    meses = max(0, mes_fim - mes_inicio + 1)
+    multa = valor_corrigido * TAXA_MULTA
     valor_com_multa = valor_corrigido + multa
-    try:
-        mes_fim = pd.Period(data_fim_str, freq="M")
-    except:
-        raise ValueError("Formato de data final inválido. Use MM/AAAA.")
-    mes_inicio = data_vencimento.to_period("M") + 1
+    juros = valor_com_multa * TAXA_JUROS_REAL * meses
+    return arredondar_centavos(valor_com_multa + juros)
+
+def calcular_tres_metodos(valor_original, data_vencimento, data_fim_str="09/2025", tabela=None):
+    """
+    (igpm_puro, conforme_cda, pratica_real) de uma fatura numa só passada.
+
+    Mesmo resultado das três funções acima, sem repetir a leitura do
+    vencimento e do mês final.
+    """
+    if _ausente(valor_original) or _ausente(data_vencimento):
+        return valor_original, valor_original, valor_original
+    tabela = tabela or carregar_tabela_fatores()
+    mes_inicio, mes_fim = _meses_correcao(data_vencimento, data_fim_str)
+    meses = max(0, mes_fim - mes_inicio + 1)
     if mes_inicio > mes_fim:
-        meses = 0
+        igpm_puro = valor_original
+    else:
+        igpm_puro = arredondar_centavos(valor_original * tabela.fator_periodo(mes_inicio, mes_fim))
+    conforme_cda = arredondar_centavos(valor_original + valor_original * TAXA_MULTA
+                                       + valor_original * TAXA_JUROS_DECLARADA * meses)
+    valor_com_multa = igpm_puro + igpm_puro * TAXA_MULTA
+    pratica_real = arredondar_centavos(valor_com_multa + valor_com_multa * TAXA_JUROS_REAL * meses)
+    return igpm_puro, conforme_cda, pratica_real
+
+# ----------------------------
+# Cálculo em lote (vetorizado)
+# ----------------------------
+METODOS_LOTE = ("igpm_puro", "conforme_cda", "pratica_real")
+
+def _preparar_lote(valores, vencimentos):
+    import numpy as np
+    import pandas as pd
+    indice = vencimentos.index if isinstance(vencimentos, pd.Series) else None
+    valores = np.asarray(valores, dtype=float)
+    vencimentos = pd.DatetimeIndex(pd.to_datetime(vencimentos))
+    validos = ~np.isnan(valores) & ~vencimentos.isna()
+    return indice, valores, ordinais_mes(vencimentos) + 1, validos
+
+def _aplicar_metodos(valores, mes_inicio, mes_fim, validos, tabela, metodos=METODOS_LOTE, fator_acum=None):
+    """
+    Núcleo comum de calcular_lote, calcular_cenarios e CarteiraCorrigida.
+
+    mes_inicio e mes_fim são ordinais que se combinam por broadcasting
+    (ex.: coluna de faturas contra linha de meses finais). fator_acum, se
+    dado, substitui a consulta à tabela (só importa onde mes_inicio <= mes_fim).
+    Arredonda com arredondar_centavos, como as funções escalares.
+    """
+    import numpy as np
+    meses = np.maximum(mes_fim - mes_inicio + 1, 0)
+    resultados = {}
+    if "igpm_puro" in metodos or "pratica_real" in metodos:
+        if fator_acum is None:
+            fator_acum = tabela.fatores_periodo(mes_inicio, mes_fim)
+        igpm_puro = np.where(meses > 0, arredondar_centavos(valores * fator_acum), valores)
+        if "igpm_puro" in metodos:
+            resultados["igpm_puro"] = igpm_puro
+        if "pratica_real" in metodos:
+            valor_com_multa = igpm_puro + igpm_puro * TAXA_MULTA
+            resultados["pratica_real"] = arredondar_centavos(valor_com_multa + valor_com_multa * TAXA_JUROS_REAL * meses)
+    if "conforme_cda" in metodos:
+        resultados["conforme_cda"] = arredondar_centavos(
+            valores + valores * TAXA_MULTA + valores * TAXA_JUROS_DECLARADA * meses
+        )
+    return {m: np.where(validos, resultados[m], valores) for m in metodos}
+
+def calcular_lote(valores, vencimentos, data_fim_str="09/2025", tabela=None):
+    """
+    Os três métodos de uma só vez para colunas inteiras de faturas.
+
+    Parâmetros:
+        valores (array/Series): valores originais das faturas
+        vencimentos (array/Series): datas de vencimento
+        data_fim_str (str): data final no formato "MM/AAAA"
+        tabela (TabelaFatores): fatores a usar (padrão: indice.csv; para
+            outro índice, carregar_tabela_indice("ipca") etc.)
+
+    Retorna:
+        DataFrame com as colunas igpm_puro, conforme_cda e pratica_real,
+        linha a linha iguais às funções escalares.
+    """
+    import pandas as pd
+    if tabela is None:
+        tabela = carregar_tabela_fatores()
+    mes_fim = ordinal_mes_fim(data_fim_str)
+    indice, valores, mes_inicio, validos = _preparar_lote(valores, vencimentos)
+    resultados = _aplicar_metodos(valores, mes_inicio, mes_fim, validos, tabela)
+    return pd.DataFrame(resultados, index=indice)
+
+def comparar_indices(valores, vencimentos, data_fim_str="09/2025", indices=None):
+    """
+    Correção monetária pura (como igpm_puro) das mesmas faturas por vários índices.
+
+    Os meses de cada fatura são calculados uma vez; cada índice custa só a
+    consulta na sua TabelaFatores. Retorna um DataFrame com uma coluna por
+    índice (padrão: todos os de indices_disponiveis()).
+    """
+    import pandas as pd
+    mes_fim = ordinal_mes_fim(data_fim_str)
+    indice, valores, mes_inicio, validos = _preparar_lote(valores, vencimentos)
+    resultados = {
+        nome: _aplicar_metodos(valores, mes_inicio, mes_fim, validos,
+                               carregar_tabela_indice(nome), ("igpm_puro",))["igpm_puro"]
+        for nome in (indices or indices_disponiveis())
+    }
+    return pd.DataFrame(resultados, index=indice)
+
+METODOS = {
+    "igpm": "igpm_puro",
+    "cda": "conforme_cda",
+    "real": "pratica_real",
+}
+
+def acrescentar_colunas(df, colunas=None, **novas):
+    """
+    df (ou só as `colunas` dele) com as colunas `novas` no fim, sem copiar as existentes.
+
+    Faz o papel de df.assign, que no pandas anterior ao 3 (sem copy-on-write)
+    copia o frame inteiro: aqui as colunas antigas são só referenciadas em
+    qualquer versão. O resultado não deve ser alterado no lugar.
+    """
+    import pandas as pd
+    return pd.DataFrame({**{col: df[col] for col in (colunas or df.columns)}, **novas}, copy=False)
+
+def corrigir_contas(contas, data_fim_str, metodos=tuple(METODOS), tabela=None):
+    """Competência, vencimento e valor das contas com uma coluna por método pedido."""
+    import pandas as pd
+    valores = valores_em_reais(contas)
+    resultado = calcular_lote(valores, contas["vencimento"], data_fim_str, tabela)
+    return acrescentar_colunas(
+        contas, ["competencia", "vencimento"],
+        valor=contas["valor"] if "valor" in contas else pd.Series(valores, index=contas.index),
+        **{METODOS[metodo]: resultado[METODOS[metodo]] for metodo in metodos},
+    )
+
+# ----------------------------
+# CSV no formato brasileiro
+# ----------------------------
+_TROCA_SEPARADORES = str.maketrans(",.", ".,")
+
+def formatar_numeros_br(valores, casas=2):
+    """
+    Coluna numérica como texto brasileiro ("1.234,56"); vazio onde não há valor.
+
+    Um único str.format formata a coluna inteira com separador de milhar e um
+    único translate troca ponto e vírgula, sem função Python por célula. O
+    arredondamento é o mesmo de f"{x:.2f}".
+    """
+    import numpy as np
+    valores = np.asarray(valores, dtype=float)
+    lista = valores.tolist()
+    textos = (f"{{:,.{casas}f}}\n" * len(lista)).format(*lista)
+    textos = np.array(textos.translate(_TROCA_SEPARADORES).split("\n")[:-1], dtype=object)
+    textos[np.isnan(valores)] = ""
+    return textos
+
+def _formatar_distintos(serie, formatar):
+    """formatar(valores distintos) aplicado a uma coluna cheia de repetições."""
+    import numpy as np
+    import pandas as pd
+    codigos, distintos = pd.factorize(serie)
+    textos = np.append(np.asarray(formatar(distintos), dtype=object), "")
+    return textos[codigos]  # código -1 (ausente) cai no "" do fim
+
+def formatar_brasileiro(df, colunas_valor=None):
+    """
+    Datas em DD/MM/AAAA e valores como "1.234,56", como nas exportações das GUIs.
+
+    colunas_valor: colunas formatadas como número (padrão: todas as de ponto
+    flutuante). Competência em ordinal vira "MM/AAAA"; as demais colunas
+    passam como estão, com vazio no lugar de ausentes.
+    """
+    import pandas as pd
+    if colunas_valor is None:
+        colunas_valor = [col for col in df.columns if df[col].dtype.kind == "f"]
+    saida = {}
+    for col in df.columns:
+        serie = df[col]
+        if col in colunas_valor:
+            saida[col] = formatar_numeros_br(serie)
+        elif serie.dtype.kind == "M":
+            saida[col] = _formatar_distintos(serie, lambda d: d.strftime("%d/%m/%Y"))
+        elif col == "competencia" and serie.dtype.kind in "iu":
+            saida[col] = _formatar_distintos(serie, lambda o: [ordinal_mes_texto(m) for m in o.tolist()])
+        else:
+            saida[col] = _formatar_distintos(serie, lambda d: [str(v) for v in d.tolist()])
+    return pd.DataFrame(saida, index=df.index, dtype=object)
+
+def _campos_csv(textos):
+    """Textos com aspas, como no módulo csv, onde houver ";", aspas ou quebra de linha."""
+    import pandas as pd
+    def citar(distintos):
+        return ['"%s"' % t.replace('"', '""') if any(c in t for c in ';"\r\n') else t for t in map(str, distintos)]
+    return _formatar_distintos(pd.Series(textos, dtype=object), citar)
+
+def gravar_csv_brasileiro(df, destino, colunas_valor=None, tamanho_bloco=100_000, progresso=None):
+    """
+    Grava df em CSV com ";" e formatar_brasileiro, bloco a bloco.
+
+    Cada bloco é formatado coluna a coluna e vai direto para o disco, então a
+    memória extra é a de um bloco de textos, não a do arquivo inteiro.
+    Números e datas nunca precisam de aspas; só as colunas de texto passam
+    pela verificação. progresso(feito, total) é chamado após cada bloco; se
+    ele (ou a gravação) levantar exceção, o arquivo incompleto é apagado.
+    """
+    if colunas_valor is None:
+        colunas_valor = [col for col in df.columns if df[col].dtype.kind == "f"]
+    textuais = [col for col in df.columns if col not in colunas_valor and df[col].dtype.kind not in "biufM"]
+    total = len(df)
+    # aberto fora do try: se a abertura falhar (arquivo somente leitura ou
+    # aberto no Excel), o arquivo que já existia fica intocado
+    f = open(destino, "w", encoding="utf-8", newline="")
+    try:
+        with f:
+            f.write(";".join(_campos_csv(list(df.columns))) + os.linesep)
+            for inicio in range(0, total, tamanho_bloco):
+                bloco = formatar_brasileiro(df.iloc[inicio:inicio + tamanho_bloco], colunas_valor)
+                campos = [_campos_csv(bloco[col]) if col in textuais else bloco[col].tolist() for col in bloco.columns]
+                f.write(os.linesep.join(map(";".join, zip(*campos))) + os.linesep)
+                if progresso is not None:
+                    progresso(min(inicio + tamanho_bloco, total), total)
+    except BaseException:
+        os.remove(destino)
+        raise
+    return destino
+
+def calcular_cenarios(valores, vencimentos, mes_inicial_str, mes_final_str, metodo="igpm_puro", tabela=None):
+    """
+    Valor de cada fatura em cada mês final de mes_inicial_str a mes_final_str.
+
+    Todas as datas finais saem da mesma tabela de fatores acumulados, numa
+    única operação (faturas × meses), em vez de uma execução por data.
+
+    Retorna:
+        DataFrame com uma linha por fatura e uma coluna "MM/AAAA" por mês.
+    """
+    import numpy as np
+    import pandas as pd
+    if metodo not in METODOS_LOTE:
+        raise ValueError(f"Método desconhecido: {metodo}")
+    if tabela is None:
+        tabela = carregar_tabela_fatores()
+    primeiro = ordinal_mes_fim(mes_inicial_str)
+    ultimo = ordinal_mes_fim(mes_final_str)
+    if primeiro > ultimo:
+        raise ValueError("O mês inicial deve ser anterior ao mês final.")
+    indice, valores, mes_inicio, validos = _preparar_lote(valores, vencimentos)
+    meses_fim = np.arange(primeiro, ultimo + 1, dtype=np.int64)
+    matriz = _aplicar_metodos(
+        valores[:, None], mes_inicio[:, None], meses_fim[None, :], validos[:, None], tabela, (metodo,)
+    )[metodo]
+    colunas = [ordinal_mes_texto(o) for o in meses_fim]
+    return pd.DataFrame(matriz, index=indice, columns=colunas)
+
+# ----------------------------
+# Carteira com atualização incremental
+# ----------------------------
+class CarteiraCorrigida:
+    """
+    Os três métodos para uma carteira de faturas, atualizáveis mês a mês.
+
+    Vencimentos e meses iniciais são resolvidos uma única vez, e cada fatura
+    guarda o produto acumulado do índice no início da sua correção (base).
+    Quando o índice ganha um mês (acrescentar_mes_indice), avancar_mes só
+    move o mês final: o fator de cada fatura vira acumulado_final / base,
+    sem reler datas nem consultar a tabela linha a linha. Os valores são
+    iguais aos de calcular_lote para o mesmo mês final (verificar_calculos.py
+    carteira).
+
+    A carteira só existe na memória; guardá-la entre uma execução e outra é
+    papel de quem chama (pickle serve: é só numpy e a TabelaFatores). Sem
+    isso, o mês seguinte é um cálculo completo com uma carteira nova.
+    """
+    def __init__(self, valores, vencimentos, data_fim_str="09/2025", tabela=None):
+        self.tabela = tabela or carregar_tabela_fatores()
+        self.indice, self.valores, self.mes_inicio, self.validos = _preparar_lote(valores, vencimentos)
+        self.mes_fim = ordinal_mes_fim(data_fim_str)
+        self.base = self._bases(self.mes_inicio)
+        self._calcular()
+
+    @property
+    def data_fim_str(self):
+        return ordinal_mes_texto(self.mes_fim)
+
+    def _bases(self, mes_inicio):
+        import numpy as np
+        ultimo = len(self.tabela.acumulado) - 1
+        return np.asarray(self.tabela.acumulado, dtype=float)[np.clip(mes_inicio - self.tabela.ordinal_inicial, 0, ultimo)]
+
+    def _calcular(self):
+        final = self.tabela.acumulado[self.tabela._posicao(self.mes_fim + 1)]
+        self.resultados = _aplicar_metodos(
+            self.valores, self.mes_inicio, self.mes_fim, self.validos, self.tabela, fator_acum=final / self.base
+        )
+
+    def avancar_mes(self, tabela=None):
+        """Leva a carteira ao mês seguinte com a tabela já estendida (padrão: indice.csv)."""
+        tabela = tabela or carregar_tabela_fatores()
+        if tabela.ordinal_inicial != self.tabela.ordinal_inicial:
+            raise ValueError("A tabela nova deve estender a série usada pela carteira.")
+        # faturas que começam depois do fim da tabela antiga tinham a base
+        # presa na última posição; só elas precisam de uma nova consulta
+        recentes = self.mes_inicio > self.tabela.ordinal_final
+        self.tabela = tabela
+        if recentes.any():
+            self.base[recentes] = self._bases(self.mes_inicio[recentes])
+        self.mes_fim += 1
+        self._calcular()
+        return self
+
+    def como_dataframe(self):
+        """DataFrame igual ao de calcular_lote (igpm_puro, conforme_cda, pratica_real)."""
+        import pandas as pd
+        return pd.DataFrame(self.resultados, index=self.indice)
+
+# ----------------------------
+# Processamento colunar das contas
+# ----------------------------
+COLUNAS_METODO = {
+    "real": ("juros_real", "total_semae_real"),
+    "cda": ("juros_00167pct", "total_cda_texto"),
+}
+
+def _periodos_contas(contas, tabela, data_fim):
+    """
+    Vencimentos, fator IGP-M acumulado e meses de juros de cada conta, mais a
+    máscara das contas com vencimento. Sem vencimento o fator é 1 e não há
+    meses de juros; quem chama decide o que publicar para essas contas.
+    """
+    import numpy as np
+    import pandas as pd
+    vencimentos = pd.DatetimeIndex(contas["vencimento"])
+    com_vencimento = ~vencimentos.isna()
+    mes_fim = ordinal_mes(data_fim)
+    inicio_correcao = ordinais_mes(vencimentos + pd.Timedelta(days=1))
+    fator_acum = tabela.fatores_periodo(inicio_correcao, np.full_like(inicio_correcao, mes_fim))
+    n_meses = np.maximum(mes_fim - (ordinais_mes(vencimentos) + 1) + 1, 0)
+    fator_acum = np.where(com_vencimento, fator_acum, 1.0)
+    n_meses = np.where(com_vencimento, n_meses, 0)
+    return vencimentos, fator_acum, n_meses, com_vencimento
+
+def processar_contas_colunar(contas, tabela, data_fim, metodo="real"):
+    """
+    Correção, multa, juros e total de todas as contas em operações de coluna.
+
+    metodo "real" reproduz a prática da SEMAE (multa e juros sobre o valor
+    corrigido); "cda" segue o texto da CDA (multa e juros sobre o original).
+    Mantém a convenção das interfaces: a correção começa no mês de
+    (vencimento + 1 dia) e os juros contam a partir do mês seguinte.
+
+    Todas as colunas são arredondadas com arredondar_centavos. O laço antigo
+    das interfaces usava round() e o resultado dependia do tipo de cada
+    parcela (float do Python ou np.float64); nos empates de meio centavo
+    (cerca de 1% dos valores) a multa ou os juros podem diferir em um
+    centavo: 1.972,75 na CDA dá multa de 39,46, não 39,45.
+
+    Contas sem vencimento ou sem valor saem com correção, multa, juros e
+    total vazios (NaN), como em calcular_lote.
+    """
+    import numpy as np
+    import pandas as pd
+    if metodo not in COLUNAS_METODO:
+        raise ValueError(f"Método desconhecido: {metodo}")
+    col_juros, col_total = COLUNAS_METODO[metodo]
+
+    vencimentos, fator_acum, n_meses, com_vencimento = _periodos_contas(contas, tabela, data_fim)
+    valor_orig = valores_em_reais(contas)
+    validas = com_vencimento & ~np.isnan(valor_orig)
+    correcao = valor_orig * (fator_acum - 1)
+
+    if metodo == "real":
+        valor_corrigido = valor_orig + correcao
+        multa = valor_corrigido * TAXA_MULTA
+        juros = valor_corrigido * TAXA_JUROS_REAL * n_meses
+        total = valor_corrigido + multa + juros
+    else:
+        multa = valor_orig * TAXA_MULTA
+        juros = valor_orig * TAXA_JUROS_DECLARADA * n_meses
+        total = valor_orig + correcao + multa + juros
+
+    return pd.DataFrame({
+        "competencia": contas["competencia"].to_numpy(),
+        "vencimento": vencimentos,
+        "valor_original": arredondar_centavos(valor_orig),
+        "correcao_igpm": np.where(validas, arredondar_centavos(correcao), np.nan),
+        "multa_2pct": np.where(validas, arredondar_centavos(multa), np.nan),
+        col_juros: np.where(validas, arredondar_centavos(juros), np.nan),
+        col_total: np.where(validas, arredondar_centavos(total), np.nan),
+    })
+
+# ----------------------------
+# Aritmética exata em centavos
+# ----------------------------
+ESCALA_FATOR = 10**8  # fatores acumulados com 8 casas decimais
+ESCALA_TAXA = 10**6   # taxas de multa/juros em milionésimos
+
+def _dividir_arredondando(numerador, divisor):
+    """Divisão inteira com arredondamento "meio para longe do zero", em int64."""
+    import numpy as np
+    numerador = np.asarray(numerador, dtype=np.int64)
+    return np.sign(numerador) * ((np.abs(numerador) + divisor // 2) // divisor)
+
+def para_centavos(valores):
+    """
+    Valores em reais (float) para centavos int64.
+
+    Valores vazios ou infinitos não têm centavos: levantam ValueError em vez
+    de virar um inteiro sem sentido.
+    """
+    import numpy as np
+    valores = np.asarray(valores, dtype=float)
+    if not np.isfinite(valores).all():
+        raise ValueError("Valores vazios ou infinitos não podem ser convertidos em centavos.")
+    return np.rint(valores * 100).astype(np.int64)
+
+def processar_contas_centavos(contas, tabela, data_fim, metodo="real", em_centavos=False):
+    """
+    Mesmo cálculo de processar_contas_colunar, com dinheiro em centavos int64.
+
+    Pontos de arredondamento (como no demonstrativo do cda.csv): a correção é
+    arredondada ao centavo; multa e juros são calculados sobre valores já em
+    centavos e arredondados cada um; o total é a soma das parcelas
+    arredondadas. O fator acumulado é fixado em ESCALA_FATOR.
+
+    Com em_centavos=True as colunas de valor saem em centavos (Int64 do
+    pandas); caso contrário, em reais. Contas sem vencimento ou sem valor
+    saem com as parcelas vazias (NA ou NaN), como em processar_contas_colunar.
+    """
+    import numpy as np
+    import pandas as pd
+    if metodo not in COLUNAS_METODO:
+        raise ValueError(f"Método desconhecido: {metodo}")
+    col_juros, col_total = COLUNAS_METODO[metodo]
+
+    vencimentos, fator_acum, n_meses, com_vencimento = _periodos_contas(contas, tabela, data_fim)
+    if "valor_centavos" in contas:
+        valor_orig = contas["valor_centavos"].to_numpy()
+        com_valor = np.ones(len(valor_orig), dtype=bool)
     else:
-        meses = (mes_fim - mes_inicio).n + 1
-    juros = valor_com_multa * 0.002345 * meses
-    return round(valor_com_multa + juros, 2)
+        reais = contas["valor"].to_numpy(dtype=float)
+        com_valor = np.isfinite(reais)
+        valor_orig = para_centavos(np.where(com_valor, reais, 0.0))
+    validas = com_vencimento & com_valor
+    fator = np.rint(fator_acum * ESCALA_FATOR).astype(np.int64)
+    correcao = _dividir_arredondando(valor_orig * (fator - ESCALA_FATOR), ESCALA_FATOR)
+    taxa_multa = round(TAXA_MULTA * ESCALA_TAXA)
+
+    if metodo == "real":
+        base = valor_orig + correcao
+        taxa_juros = round(TAXA_JUROS_REAL * ESCALA_TAXA)
+    else:
+        base = valor_orig
+        taxa_juros = round(TAXA_JUROS_DECLARADA * ESCALA_TAXA)
+    multa = _dividir_arredondando(base * taxa_multa, ESCALA_TAXA)
+    juros = _dividir_arredondando(base * taxa_juros * n_meses, ESCALA_TAXA)
+    total = valor_orig + correcao + multa + juros
+
+    valores = {
+        "valor_original": (valor_orig, com_valor),
+        "correcao_igpm": (correcao, validas),
+        "multa_2pct": (multa, validas),
+        col_juros: (juros, validas),
+        col_total: (total, validas),
+    }
+    if em_centavos:
+        valores = {col: pd.arrays.IntegerArray(v, ~mascara) for col, (v, mascara) in valores.items()}
+    else:
+        valores = {col: np.where(mascara, v / 100, np.nan) for col, (v, mascara) in valores.items()}
+    return pd.DataFrame({
+        "competencia": contas["competencia"].to_numpy(),
+        "vencimento": vencimentos,
+        **valores,
+    })
+
+# ----------------------------
+# Demonstrativo mês a mês
+# ----------------------------
+COLUNAS_DEMONSTRATIVO = ["Competência Original", "Mês de Correção", "Índice (%)", "Fator", "Valor Atualizado"]
+
+def gerar_demonstrativos(contas, igpm_series, mes_fim_str):
+    """
+    Evolução mês a mês da correção de várias contas, em formato longo.
+
+    Uma linha por conta e mês do índice entre o mês seguinte ao vencimento e
+    mes_fim_str, com as colunas de COLUNAS_DEMONSTRATIVO precedidas de
+    "conta" (rótulo da conta no índice de `contas`). Contas sem mês a corrigir
+    ganham uma linha "—", e as sem índice no período uma linha "Sem índices";
+    contas sem vencimento ou valor ficam de fora. igpm_series é o DataFrame
+    com a coluna "fator" de carregar_indice.
+
+    Os meses de todas as contas são montados de uma vez; o valor atualizado
+    é um produto acumulado por conta (groupby.cumprod), multiplicado na
+    mesma ordem do laço mês a mês, então os valores não mudam
+    (verificar_calculos.py demonstrativos).
+    """
+    import numpy as np
+    import pandas as pd
+    mes_fim = ordinal_mes_fim(mes_fim_str)
+    valores = valores_em_reais(contas)
+    vencimentos = pd.DatetimeIndex(contas["vencimento"])
+    validas = ~np.isnan(valores) & ~vencimentos.isna()
+    rotulos = contas.index[validas]
+    valores = valores[validas]
+    competencias = contas["competencia"].to_numpy()[validas]
+    if competencias.dtype.kind in "iu":
+        competencias = np.array([ordinal_mes_texto(o) for o in competencias.tolist()], dtype=object)
+    mes_inicio = ordinais_mes(vencimentos[validas]) + 1
+
+    meses_indice = ordinais_mes(igpm_series.index)
+    fatores = igpm_series["fator"].to_numpy(dtype=float)
+    textos_mes = np.asarray(igpm_series.index.strftime("%m/%Y"), dtype=object)
+    primeiro = np.searchsorted(meses_indice, mes_inicio, side="left")
+    n_meses = np.where(mes_inicio > mes_fim, 0,
+                       np.maximum(np.searchsorted(meses_indice, mes_fim, side="right") - primeiro, 0))
+
+    # Cada conta com meses vira um segmento [valor, f1, f2, ...]; o cumprod
+    # do segmento dá valor*f1, (valor*f1)*f2, ... e a primeira linha é descartada.
+    com_meses = np.flatnonzero(n_meses > 0)
+    tamanhos = n_meses[com_meses] + 1
+    conta_seg = np.repeat(com_meses, tamanhos)
+    passo = np.arange(tamanhos.sum()) - np.repeat(np.cumsum(tamanhos) - tamanhos, tamanhos)
+    posicao = np.repeat(primeiro[com_meses], tamanhos) + passo - 1
+    fator_seg = fatores[np.maximum(posicao, 0)]
+    sequencia = np.where(passo == 0, valores[conta_seg], fator_seg)
+    acumulado = pd.Series(sequencia).groupby(conta_seg).cumprod().to_numpy()
+    meses = passo > 0
+    conta_mes, posicao, fator_mes = conta_seg[meses], posicao[meses], fator_seg[meses]
+
+    sem_meses = np.flatnonzero(n_meses == 0)
+    conta = np.concatenate([conta_mes, sem_meses])
+    ordem = np.argsort(conta, kind="stable")
+    conta = conta[ordem]
+    n_sem = len(sem_meses)
+    return pd.DataFrame({
+        "conta": rotulos[conta],
+        "Competência Original": competencias[conta],
+        "Mês de Correção": np.concatenate([
+            textos_mes[posicao],
+            np.where(mes_inicio[sem_meses] > mes_fim, "—", "Sem índices").astype(object),
+        ])[ordem],
+        "Índice (%)": np.concatenate([np.round((fator_mes - 1) * 100, 4), np.zeros(n_sem)])[ordem],
+        "Fator": np.concatenate([np.round(fator_mes, 6), np.ones(n_sem)])[ordem],
+        "Valor Atualizado": np.concatenate([np.round(acumulado[meses], 2), valores[sem_meses]])[ordem],
+    })
+
+def gerar_demonstrativo(conta_row, igpm_series, mes_fim_str):
+    """Demonstrativo de uma conta (linha de contas); ver gerar_demonstrativos."""
+    import pandas as pd
+    if pd.isna(conta_row["vencimento"]) or pd.isna(conta_row["valor"]):
+        return pd.DataFrame()
+    conta = pd.DataFrame({
+        "competencia": [conta_row["competencia"]],
+        "vencimento": pd.DatetimeIndex([conta_row["vencimento"]]),
+        "valor": [float(conta_row["valor"])],
+    })
+    return gerar_demonstrativos(conta, igpm_series, mes_fim_str)[COLUNAS_DEMONSTRATIVO]
@@ -775,16 +775,13 @@ if __name__ == "__main__":
     root.mainloop()
 '''
 # versao com impressão
-import pandas as pd
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-from datetime import datetime
-import os
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import A4
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib.units import inch
+from calculos import (
+    acrescentar_colunas, carregar_dados, calcular_lote, gerar_demonstrativo, gravar_csv_brasileiro, ordinal_mes_fim,
+)
+from tabela_virtual import TabelaVirtual, formatar_datas, formatar_reais, formatar_texto
+from tarefas_gui import PainelTarefa, em_blocos
 
 # ----------------------------
 # Metodologia explicativa
@@ -821,129 +818,6 @@ Pagas da seguinte forma: 4000 a vista. e o restante com cheque para 30
 dias. 
 """
 
-# ----------------------------
-# Carregar dados
-# ----------------------------
-def carregar_dados():
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    contas_path = os.path.join(script_dir, "CONTASFORMATADAS.csv")
-    indices_path = os.path.join(script_dir, "indice.csv")
-
-    contas = pd.read_csv(
-        contas_path,
-        sep=",",
-        quotechar='"',
-        decimal=",",
-        dtype={"competencia": str, "tipo": str}
-    )
-    contas = contas.dropna(subset=["competencia", "vencimento", "valor"])
-    contas["valor"] = pd.to_numeric(contas["valor"].astype(str).str.replace(".", "").str.replace(",", "."), errors="coerce")
-    contas["vencimento"] = pd.to_datetime(contas["vencimento"], dayfirst=True, errors="coerce")
-
-    igpm = pd.read_csv(indices_path, sep=",", quotechar='"', decimal=",")
-    igpm["Data"] = pd.to_datetime(igpm["Data"], format="%m/%Y")
-    igpm = igpm.set_index("Data").sort_index()
-    igpm["fator"] = 1 + igpm["Indice"] / 100.0
-
-    return contas, igpm
-
-# ----------------------------
-# Gerar demonstrativo
-# ----------------------------
-def gerar_demonstrativo(conta_row, igpm_series, mes_fim_str):
-    vencimento = conta_row["vencimento"]
-    valor_inicial = conta_row["valor"]
-    competencia = conta_row["competencia"]
-
-    if pd.isna(vencimento) or pd.isna(valor_inicial):
-        return pd.DataFrame()
-
-    try:
-        mes_fim = pd.Period(mes_fim_str, freq="M")
-    except:
-        raise ValueError("Formato de data inválido. Use MM/AAAA.")
-
-    mes_inicio = vencimento.to_period("M") + 1
-    if mes_inicio > mes_fim:
-        return pd.DataFrame([{
-            "Competência Original": competencia,
-            "Mês de Correção": "—",
-            "Índice (%)": 0.0000,
-            "Fator": 1.000000,
-            "Valor Atualizado": valor_inicial
-        }])
-
-    dt_inicio = mes_inicio.start_time
-    dt_fim = mes_fim.end_time
-    fatores = igpm_series.loc[dt_inicio:dt_fim]
-
-    if fatores.empty:
-        return pd.DataFrame([{
-            "Competência Original": competencia,
-            "Mês de Correção": "Sem índices",
-            "Índice (%)": 0.0000,
-            "Fator": 1.000000,
-            "Valor Atualizado": valor_inicial
-        }])
-
-    evolucao = []
-    valor_atual = valor_inicial
-    for dt, row in fatores.iterrows():
-        mes_str = dt.strftime("%m/%Y")
-        indice_pct = (row["fator"] - 1) * 100
-        fator = row["fator"]
-        valor_atual *= fator
-        evolucao.append({
-            "Competência Original": competencia,
-            "Mês de Correção": mes_str,
-            "Índice (%)": round(indice_pct, 4),
-            "Fator": round(fator, 6),
-            "Valor Atualizado": round(valor_atual, 2)
-        })
-    return pd.DataFrame(evolucao)
-
-# ----------------------------
-# Gerar PDF do demonstrativo
-# ----------------------------
-def gerar_pdf_demonstrativo(df_demo, competencia, filepath):
-    doc = SimpleDocTemplate(filepath, pagesize=A4)
-    styles = getSampleStyleSheet()
-    story = []
-
-    title = Paragraph(f"Demonstrativo Analítico - Competência {competencia}", styles['Title'])
-    story.append(title)
-    story.append(Spacer(1, 12))
-
-    # Cabeçalho
-    data = [list(df_demo.columns)]
-    for _, row in df_demo.iterrows():
-        linha = []
-        for col in df_demo.columns:
-            if col == "Valor Atualizado":
-                linha.append(f"R$ {row[col]:.2f}")
-            elif col == "Índice (%)":
-                linha.append(f"{row[col]:.4f}")
-            elif col == "Fator":
-                linha.append(f"{row[col]:.6f}")
-            else:
-                linha.append(str(row[col]))
-        data.append(linha)
-
-    table = Table(data)
-    table.setStyle(TableStyle([
-        ('BACKGROUND', (0,0), (-1,0), colors.grey),
-        ('TEXTCOLOR', (0,0), (-1,0), colors.whitesmoke),
-        ('ALIGN', (0,0), (-1,-1), 'CENTER'),
-        ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0,0), (-1,0), 10),
-        ('BOTTOMPADDING', (0,0), (-1,0), 12),
-        ('GRID', (0,0), (-1,-1), 1, colors.black),
-        ('FONTSIZE', (0,1), (-1,-1), 9),
-    ]))
-
-    story.append(table)
-    doc.build(story)
-
 # ----------------------------
 # Aplicação principal
 # ----------------------------
@@ -974,77 +848,71 @@ class App:
         ttk.Button(frame_ctrl, text="Calcular Correção", command=self.calcular_correcao).pack(side="left", padx=5)
         ttk.Button(frame_ctrl, text="Demonstrativo Analítico", command=self.mostrar_demonstrativo).pack(side="left", padx=5)
         ttk.Button(frame_ctrl, text="Exportar Todas as Contas", command=self.exportar_todas).pack(side="left", padx=5)
+        ttk.Button(frame_ctrl, text="PDFs de Todas as Contas", command=self.exportar_pdfs_todas).pack(side="left", padx=5)
+        ttk.Button(frame_ctrl, text="Relatório da Carteira", command=self.exportar_relatorio_carteira).pack(side="left", padx=5)
         ttk.Button(frame_ctrl, text="Como foi calculado?", command=self.mostrar_metodologia).pack(side="left", padx=5)
 
+        self.painel = PainelTarefa(root)
+        self.painel.pack(padx=10, fill="x")
+
         # Tabela
         frame_table = ttk.Frame(root)
         frame_table.pack(fill="both", expand=True, padx=10, pady=10)
 
         cols = ("competencia", "vencimento", "valor", "valor_corrigido")
-        self.tree = ttk.Treeview(frame_table, columns=cols, show="headings")
-        for col, txt in zip(cols, ["Competência", "Vencimento", "Valor Original", "Valor Corrigido"]):
-            self.tree.heading(col, text=txt)
-            self.tree.column(col, width=150, anchor="center")
-        self.tree.pack(side="left", fill="both", expand=True)
-
-        scrollbar = ttk.Scrollbar(frame_table, orient="vertical", command=self.tree.yview)
-        scrollbar.pack(side="right", fill="y")
-        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tabela = TabelaVirtual(
+            frame_table, cols, ["Competência", "Vencimento", "Valor Original", "Valor Corrigido"], largura=150
+        )
+        self.tabela.pack(fill="both", expand=True)
 
         self.carregar_tabela()
 
     def carregar_tabela(self):
-        for item in self.tree.get_children():
-            self.tree.delete(item)
         df = self.contas_original if self.contas_corrigidas is None else self.contas_corrigidas
-        for _, row in df.iterrows():
-            venc = row["vencimento"].strftime("%d/%m/%Y") if pd.notna(row["vencimento"]) else ""
-            val_orig = f"R$ {row['valor']:.2f}" if pd.notna(row["valor"]) else ""
-            val_corr = f"R$ {row.get('valor_corrigido', ''):.2f}" if self.contas_corrigidas is not None and pd.notna(row.get('valor_corrigido', None)) else ""
-            self.tree.insert("", "end", values=(row["competencia"], venc, val_orig, val_corr))
+        self.tabela.carregar(self.colunas_tabela(df))
+
+    def colunas_tabela(self, df):
+        colunas = {
+            "competencia": formatar_texto(df["competencia"]),
+            "vencimento": formatar_datas(df["vencimento"]),
+            "valor": formatar_reais(df["valor"]),
+        }
+        if "valor_corrigido" in df:
+            colunas["valor_corrigido"] = formatar_reais(df["valor_corrigido"])
+        return colunas
 
     def calcular_correcao(self):
         mes_fim = self.entry_mes.get().strip() or "09/2025"
         try:
-            mes_fim_period = pd.Period(mes_fim, freq="M")
-        except:
+            ordinal_mes_fim(mes_fim)
+        except ValueError:
             messagebox.showerror("Erro", "Formato de data inválido. Use MM/AAAA.")
             return
 
-        def aplicar(row):
-            venc = row["vencimento"]
-            if pd.isna(venc):
-                return row["valor"]
-            mes_inicio = venc.to_period("M") + 1
-            if mes_inicio > mes_fim_period:
-                return row["valor"]
-            dt_inicio = mes_inicio.start_time
-            dt_fim = mes_fim_period.end_time
-            fatores = self.igpm.loc[dt_inicio:dt_fim, "fator"]
-            fator_acum = fatores.prod() if not fatores.empty else 1.0
-            return row["valor"] * fator_acum
+        def trabalhar(tarefa):
+            contas = self.contas_original
+            corrigido = em_blocos(
+                tarefa, contas, lambda bloco: calcular_lote(bloco["valor"], bloco["vencimento"], mes_fim)["igpm_puro"]
+            )
+            df = acrescentar_colunas(contas, valor_corrigido=corrigido)  # sem copiar as colunas originais
+            return df, self.colunas_tabela(df)
 
-        self.contas_corrigidas = self.contas_original.copy()
-        self.contas_corrigidas["valor_corrigido"] = self.contas_corrigidas.apply(aplicar, axis=1)
-        self.contas_corrigidas["valor_corrigido"] = self.contas_corrigidas["valor_corrigido"].round(2)
-        self.carregar_tabela()
-        messagebox.showinfo("Sucesso", f"Correção calculada até {mes_fim}.")
+        def concluir(resultado):
+            self.contas_corrigidas, colunas = resultado
+            self.tabela.carregar(colunas)
+            messagebox.showinfo("Sucesso", f"Correção calculada até {mes_fim}.")
+
+        self.painel.executar("Calculando", trabalhar, concluir, "Falha no cálculo")
 
     def mostrar_demonstrativo(self):
-        selected = self.tree.focus()
-        if not selected:
+        linha = self.tabela.linha_selecionada()
+        if linha is None:
             messagebox.showwarning("Atenção", "Selecione uma conta na tabela.")
             return
 
-        valores = self.tree.item(selected, "values")
-        competencia_sel = valores[0]
-
         df_base = self.contas_corrigidas if self.contas_corrigidas is not None else self.contas_original
-        conta = df_base[df_base["competencia"] == competencia_sel]
-        if conta.empty:
-            messagebox.showerror("Erro", "Conta não encontrada.")
-            return
-        conta_row = conta.iloc[0]
+        conta_row = df_base.iloc[linha]
+        competencia_sel = conta_row["competencia"]
 
         mes_fim = self.entry_mes.get().strip() or "09/2025"
         try:
@@ -1093,11 +961,14 @@ class App:
         def exportar_demo_pdf():
             path = filedialog.asksaveasfilename(defaultextension=".pdf", filetypes=[("PDF", "*.pdf")])
             if path:
-                try:
+                def trabalhar(tarefa):
+                    from relatorio_pdf import gerar_pdf_demonstrativo  # reportlab só carrega aqui
                     gerar_pdf_demonstrativo(df_demo, competencia_sel, path)
-                    messagebox.showinfo("Sucesso", "PDF gerado com sucesso!")
-                except Exception as e:
-                    messagebox.showerror("Erro", f"Falha ao gerar PDF:\n{e}")
+
+                self.painel.executar(
+                    "Gerando PDF", trabalhar,
+                    lambda _: messagebox.showinfo("Sucesso", "PDF gerado com sucesso!"), "Falha ao gerar PDF"
+                )
 
         btn_frame = ttk.Frame(top)
         btn_frame.pack(pady=5)
@@ -1113,11 +984,67 @@ class App:
         if not path:
             return
 
-        df_export = self.contas_corrigidas.copy()
-        df_export["valor"] = df_export["valor"].map(lambda x: f"{x:.2f}".replace(".", ","))
-        df_export["valor_corrigido"] = df_export["valor_corrigido"].map(lambda x: f"{x:.2f}".replace(".", ","))
-        df_export.to_csv(path, index=False, sep=";", decimal=",")
-        messagebox.showinfo("Sucesso", f"Todas as contas corrigidas foram exportadas!\nArquivo: {path}")
+        def trabalhar(tarefa):
+            return gravar_csv_brasileiro(
+                self.contas_corrigidas, path, ["valor", "valor_corrigido"], progresso=tarefa.progresso
+            )
+
+        self.painel.executar(
+            "Exportando", trabalhar,
+            lambda caminho: messagebox.showinfo(
+                "Sucesso", f"Todas as contas corrigidas foram exportadas!\nArquivo: {caminho}"
+            ),
+            "Falha ao exportar",
+        )
+
+    def exportar_pdfs_todas(self):
+        mes_fim = self.entry_mes.get().strip() or "09/2025"
+        try:
+            ordinal_mes_fim(mes_fim)
+        except ValueError:
+            messagebox.showerror("Erro", "Formato de data inválido. Use MM/AAAA.")
+            return
+
+        path = filedialog.asksaveasfilename(defaultextension=".zip", filetypes=[("ZIP", "*.zip")])
+        if not path:
+            return
+
+        def trabalhar(tarefa):
+            import multiprocessing
+            from relatorio_pdf import gerar_pdfs_demonstrativos  # reportlab só carrega aqui
+            # "spawn": não herda as threads do Tk nos processos trabalhadores
+            return gerar_pdfs_demonstrativos(
+                self.contas_original, self.igpm[["fator"]], mes_fim, path,
+                tarefa=tarefa, mp_context=multiprocessing.get_context("spawn"),
+            )
+
+        self.painel.executar(
+            "Gerando PDFs", trabalhar,
+            lambda total: messagebox.showinfo("Sucesso", f"{total} demonstrativos gravados em:\n{path}"),
+            "Falha ao gerar PDFs",
+        )
+
+    def exportar_relatorio_carteira(self):
+        mes_fim = self.entry_mes.get().strip() or "09/2025"
+        try:
+            ordinal_mes_fim(mes_fim)
+        except ValueError:
+            messagebox.showerror("Erro", "Formato de data inválido. Use MM/AAAA.")
+            return
+
+        path = filedialog.asksaveasfilename(defaultextension=".pdf", filetypes=[("PDF", "*.pdf")])
+        if not path:
+            return
+
+        def trabalhar(tarefa):
+            from relatorio_pdf import gerar_pdf_carteira  # reportlab só carrega aqui
+            return gerar_pdf_carteira(self.contas_original, path, mes_fim, tarefa=tarefa)
+
+        self.painel.executar(
+            "Gerando relatório", trabalhar,
+            lambda paginas: messagebox.showinfo("Sucesso", f"Relatório com {paginas} páginas gravado em:\n{path}"),
+            "Falha ao gerar o relatório",
+        )
 
     def mostrar_metodologia(self):
         top = tk.Toplevel(self.root)
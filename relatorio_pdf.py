@@ -0,0 +1,330 @@
+# relatorio_pdf.py
+# Geração dos PDFs (reportlab). Importado só na hora de exportar, para que
+# as telas e os cálculos abram sem carregar o reportlab.
+#
+#   python relatorio_pdf.py demonstrativos.zip --fim 09/2025 --processos 0
+import argparse
+import os
+import sys
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.pdfgen import canvas
+
+# ----------------------------
+# Gerar PDF do demonstrativo
+# ----------------------------
+def _linhas_demonstrativo(df_demo):
+    """Cabeçalho e linhas de texto da tabela, formatados coluna a coluna."""
+    colunas = []
+    for col in df_demo.columns:
+        valores = df_demo[col].tolist()
+        if col == "Valor Atualizado":
+            colunas.append([f"R$ {v:.2f}" for v in valores])
+        elif col == "Índice (%)":
+            colunas.append([f"{v:.4f}" for v in valores])
+        elif col == "Fator":
+            colunas.append([f"{v:.6f}" for v in valores])
+        else:
+            colunas.append([str(v) for v in valores])
+    return [list(df_demo.columns)] + [list(linha) for linha in zip(*colunas)]
+
+def gerar_pdf_demonstrativo(df_demo, competencia, filepath):
+    doc = SimpleDocTemplate(filepath, pagesize=A4)
+    styles = getSampleStyleSheet()
+    story = []
+
+    title = Paragraph(f"Demonstrativo Analítico - Competência {competencia}", styles['Title'])
+    story.append(title)
+    story.append(Spacer(1, 12))
+
+    data = _linhas_demonstrativo(df_demo)
+    table = Table(data)
+    table.setStyle(TableStyle([
+        ('BACKGROUND', (0,0), (-1,0), colors.grey),
+        ('TEXTCOLOR', (0,0), (-1,0), colors.whitesmoke),
+        ('ALIGN', (0,0), (-1,-1), 'CENTER'),
+        ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0,0), (-1,0), 10),
+        ('BOTTOMPADDING', (0,0), (-1,0), 12),
+        ('GRID', (0,0), (-1,-1), 1, colors.black),
+        ('FONTSIZE', (0,1), (-1,-1), 9),
+    ]))
+
+    story.append(table)
+    doc.build(story)
+
+# ----------------------------
+# Demonstrativos de todas as contas
+# ----------------------------
+CONTAS_POR_LOTE = 16  # PDFs por envio ao processo trabalhador
+
+def nome_arquivo_demonstrativo(posicao, competencia):
+    return f"demonstrativo_{posicao + 1:05d}_{str(competencia).replace('/', '-')}.pdf"
+
+def _renderizar_lote(itens):
+    """No processo trabalhador: [(nome, df_demo, competência)] -> [(nome, bytes do PDF)]."""
+    pdfs = []
+    for nome, df_demo, competencia in itens:
+        buffer = BytesIO()
+        gerar_pdf_demonstrativo(df_demo, competencia, buffer)
+        pdfs.append((nome, buffer.getvalue()))
+    return pdfs
+
+def _itens_demonstrativos(contas, igpm_series, mes_fim_str):
+    """Um único cálculo vetorizado, repartido em (nome, df_demo, competência) por conta."""
+    from calculos import COLUNAS_DEMONSTRATIVO, gerar_demonstrativos
+    # "conta" traz o rótulo do índice; numeradas por posição, contas com
+    # rótulos repetidos (ex.: dois arquivos concatenados) não se misturam
+    longo = gerar_demonstrativos(contas.reset_index(drop=True), igpm_series, mes_fim_str)
+    itens = []
+    for posicao, (_, df_demo) in enumerate(longo.groupby("conta", sort=False)):
+        df_demo = df_demo[COLUNAS_DEMONSTRATIVO].reset_index(drop=True)
+        competencia = df_demo["Competência Original"].iloc[0]
+        itens.append((nome_arquivo_demonstrativo(posicao, competencia), df_demo, competencia))
+    return itens
+
+def gerar_pdfs_demonstrativos(contas, igpm_series, mes_fim_str, destino, processos=None, tarefa=None,
+                              mp_context=None):
+    """
+    Um PDF de demonstrativo por conta, gravados num .zip ou numa pasta.
+
+    O demonstrativo de todas as contas sai de uma só chamada a
+    gerar_demonstrativos; só a montagem dos PDFs é repartida entre
+    `processos` processos (padrão: todos os núcleos; 1 = sem pool), em lotes
+    de CONTAS_POR_LOTE. Os arquivos são gravados na ordem das contas. Com uma
+    `tarefa` (tarefas_gui.Tarefa) o progresso é informado a cada lote e o
+    cancelamento é atendido; um .zip incompleto é apagado.
+    Retorna o número de PDFs gravados.
+    """
+    itens = _itens_demonstrativos(contas, igpm_series, mes_fim_str)
+    lotes = [itens[i:i + CONTAS_POR_LOTE] for i in range(0, len(itens), CONTAS_POR_LOTE)]
+    processos = processos or os.cpu_count() or 1
+    em_zip = str(destino).lower().endswith(".zip")
+    if not em_zip:
+        os.makedirs(destino, exist_ok=True)
+
+    gravados = 0
+    arquivo_zip = zipfile.ZipFile(destino, "w") if em_zip else None  # PDFs já vêm comprimidos
+
+    def gravar(pdfs):
+        nonlocal gravados
+        for nome, conteudo in pdfs:
+            if arquivo_zip is not None:
+                arquivo_zip.writestr(nome, conteudo)
+            else:
+                with open(os.path.join(destino, nome), "wb") as f:
+                    f.write(conteudo)
+        gravados += len(pdfs)
+        if tarefa is not None:
+            tarefa.progresso(gravados, len(itens))
+
+    try:
+        if processos <= 1:
+            for lote in lotes:
+                gravar(_renderizar_lote(lote))
+        else:
+            pool = ProcessPoolExecutor(processos, mp_context=mp_context)
+            try:
+                pendentes = deque()
+                for lote in lotes:
+                    pendentes.append(pool.submit(_renderizar_lote, lote))
+                    if len(pendentes) >= 2 * processos:
+                        gravar(pendentes.popleft().result())
+                while pendentes:
+                    gravar(pendentes.popleft().result())
+            finally:
+                pool.shutdown(cancel_futures=True)
+    except BaseException:
+        if arquivo_zip is not None:
+            arquivo_zip.close()
+            os.remove(destino)
+        raise
+    if arquivo_zip is not None:
+        arquivo_zip.close()
+    return gravados
+
+# ----------------------------
+# Relatório consolidado da carteira
+# ----------------------------
+# Desenhado direto no canvas, página a página: cada bloco de contas é
+# calculado, escrito e descartado, e a página pronta vai comprimida para o
+# documento. Ao contrário de um Table do platypus, nada é montado para o
+# relatório inteiro, então a memória cresce só com as páginas comprimidas.
+TITULOS_METODO = {
+    "igpm_puro": "IGP-M puro",
+    "conforme_cda": "Conforme CDA",
+    "pratica_real": "Prática real",
+}
+MARGEM = 40
+ALTURA_LINHA = 13
+
+class _TabelaPaginada:
+    """Escreve linhas de uma tabela no canvas, repetindo título e cabeçalho a cada página."""
+    def __init__(self, pdf, titulo, cabecalho, larguras):
+        self.pdf = pdf
+        self.titulo = titulo
+        self.cabecalho = cabecalho
+        largura_util = A4[0] - 2 * MARGEM
+        escala = largura_util / sum(larguras)
+        self.bordas = [MARGEM]
+        for largura in larguras:
+            self.bordas.append(self.bordas[-1] + largura * escala)
+        self.y = None
+
+    def _nova_pagina(self):
+        pdf = self.pdf
+        pdf.setFont("Helvetica-Bold", 12)
+        pdf.drawString(MARGEM, A4[1] - MARGEM, self.titulo)
+        pdf.setFont("Helvetica", 7)
+        pdf.drawRightString(A4[0] - MARGEM, MARGEM / 2, f"Página {pdf.getPageNumber()}")
+        self.y = A4[1] - MARGEM - 2 * ALTURA_LINHA
+        pdf.setFillColor(colors.grey)
+        pdf.rect(MARGEM, self.y - 3, self.bordas[-1] - MARGEM, ALTURA_LINHA, stroke=0, fill=1)
+        pdf.setFillColor(colors.whitesmoke)
+        self._escrever(self.cabecalho, "Helvetica-Bold")
+        pdf.setFillColor(colors.black)
+
+    def _escrever(self, valores, fonte):
+        pdf = self.pdf
+        pdf.setFont(fonte, 8)
+        for i, valor in enumerate(valores):
+            # primeira coluna à esquerda, as demais (números) à direita
+            if i == 0:
+                pdf.drawString(self.bordas[0] + 2, self.y, valor)
+            else:
+                pdf.drawRightString(self.bordas[i + 1] - 2, self.y, valor)
+        self.y -= ALTURA_LINHA
+
+    def linha(self, valores, negrito=False):
+        if self.y is None or self.y < MARGEM:
+            if self.y is not None:
+                self.pdf.showPage()
+            self._nova_pagina()
+        self._escrever(valores, "Helvetica-Bold" if negrito else "Helvetica")
+
+    def encerrar(self):
+        if self.y is None:
+            self._nova_pagina()
+        self.pdf.showPage()
+        self.y = None
+
+def _blocos_carteira(contas, tamanho_bloco):
+    from calculos import ler_contas_em_blocos
+    if isinstance(contas, (str, os.PathLike)):
+        for bloco in ler_contas_em_blocos(contas, tamanho_bloco):
+            yield bloco.dropna(subset=["vencimento", "valor"])
+    else:
+        contas = contas.dropna(subset=["vencimento", "valor"])
+        for inicio in range(0, len(contas), tamanho_bloco):
+            yield contas.iloc[inicio:inicio + tamanho_bloco]
+
+def _reais(valor):
+    return f"R$ {valor:.2f}"
+
+def gerar_pdf_carteira(contas, destino, data_fim_str="09/2025", metodos=None, tabela=None,
+                       tamanho_bloco=10_000, tarefa=None):
+    """
+    Relatório único da carteira: uma linha por conta e um resumo por método.
+
+    `contas` é um DataFrame (ler_contas) ou o caminho de um arquivo no formato
+    do CONTASFORMATADAS.csv, lido em blocos de tamanho_bloco. metodos são as
+    chaves de calculos.METODOS (padrão: os três). As páginas das contas
+    repetem título e cabeçalho; no fim vem uma página de resumo por método,
+    com os totais por ano de vencimento. Com uma `tarefa` (tarefas_gui.Tarefa)
+    o progresso é informado a cada bloco. Retorna o número de páginas.
+    """
+    from calculos import METODOS, corrigir_contas
+    metodos = tuple(metodos or METODOS)
+    colunas = [METODOS[m] for m in metodos]
+    total_contas = None if isinstance(contas, (str, os.PathLike)) else len(contas)
+
+    pdf = canvas.Canvas(destino, pagesize=A4, pageCompression=1)
+    pdf.setTitle(f"Carteira corrigida até {data_fim_str}")
+    detalhe = _TabelaPaginada(
+        pdf, f"Carteira corrigida até {data_fim_str}",
+        ["Competência", "Vencimento", "Valor original"] + [TITULOS_METODO[c] for c in colunas],
+        [1, 1, 1.3] + [1.3] * len(colunas),
+    )
+    # resumo acumulado por ano de vencimento: [faturas, original, corrigido por método...]
+    resumo = {}
+    feitas = 0
+    for bloco in _blocos_carteira(contas, tamanho_bloco):
+        corrigidas = corrigir_contas(bloco, data_fim_str, metodos, tabela)
+        textos = [
+            corrigidas["competencia"].astype(str).tolist(),
+            corrigidas["vencimento"].dt.strftime("%d/%m/%Y").tolist(),
+            [_reais(v) for v in corrigidas["valor"].tolist()],
+        ] + [[_reais(v) for v in corrigidas[c].tolist()] for c in colunas]
+        for linha in zip(*textos):
+            detalhe.linha(linha)
+
+        somas = corrigidas.groupby(corrigidas["vencimento"].dt.year)[["valor"] + colunas].agg(["count", "sum"])
+        for ano, soma in somas.iterrows():
+            acumulado = resumo.setdefault(int(ano), [0, 0.0] + [0.0] * len(colunas))
+            acumulado[0] += int(soma[("valor", "count")])
+            acumulado[1] += soma[("valor", "sum")]
+            for i, c in enumerate(colunas):
+                acumulado[2 + i] += soma[(c, "sum")]
+        feitas += len(bloco)
+        if tarefa is not None:
+            tarefa.progresso(feitas, total_contas or feitas)
+    detalhe.encerrar()
+
+    for i, c in enumerate(colunas):
+        pagina = _TabelaPaginada(
+            pdf, f"Resumo — {TITULOS_METODO[c]} (até {data_fim_str})",
+            ["Ano de vencimento", "Faturas", "Valor original", "Valor corrigido", "Diferença"],
+            [1.2, 0.8, 1.3, 1.3, 1.3],
+        )
+        totais = [0, 0.0, 0.0]
+        for ano in sorted(resumo):
+            n, original, corrigido = resumo[ano][0], resumo[ano][1], resumo[ano][2 + i]
+            pagina.linha([str(ano), str(n), _reais(original), _reais(corrigido), _reais(corrigido - original)])
+            totais = [totais[0] + n, totais[1] + original, totais[2] + corrigido]
+        pagina.linha(["Total", str(totais[0]), _reais(totais[1]), _reais(totais[2]), _reais(totais[2] - totais[1])],
+                     negrito=True)
+        pagina.encerrar()
+
+    paginas = pdf.getPageNumber() - 1
+    pdf.save()
+    return paginas
+
+# ----------------------------
+# Executar
+# ----------------------------
+def main(argv=None):
+    from calculos import CONTAS_PATH, carregar_indice, ler_contas
+    parser = argparse.ArgumentParser(description="Gera o demonstrativo em PDF de cada conta.")
+    parser.add_argument("destino", help="arquivo .zip ou pasta onde gravar os PDFs (com --carteira, o PDF)")
+    parser.add_argument("-c", "--carteira", action="store_true",
+                        help="gera um único PDF da carteira, com resumo por método, em vez de um PDF por conta")
+    parser.add_argument("-e", "--entrada", default=CONTAS_PATH,
+                        help="arquivo no formato do CONTASFORMATADAS.csv")
+    parser.add_argument("-f", "--fim", default="09/2025",
+                        help="mês final da correção, MM/AAAA (padrão: 09/2025)")
+    parser.add_argument("-p", "--processos", type=int, default=0,
+                        help=f"processos em paralelo; 0 = todos os núcleos ({os.cpu_count()})")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.carteira:
+            paginas = gerar_pdf_carteira(args.entrada, args.destino, args.fim)
+            print(f"Relatório da carteira com {paginas} páginas gravado em {args.destino}.", file=sys.stderr)
+            return 0
+        igpm, _ = carregar_indice()
+        contas = ler_contas(args.entrada)
+        total = gerar_pdfs_demonstrativos(contas, igpm[["fator"]], args.fim, args.destino, args.processos)
+    except (OSError, ValueError) as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 1
+    print(f"{total} demonstrativos gravados em {args.destino}.", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,196 @@
+# semae_api.py
+# Serviço HTTP/JSON com os três métodos de cálculo, só com a biblioteca padrão.
+#
+#   python semae_api.py --porta 8000
+#
+#   GET  /saude     -> situação do serviço e período coberto pelo índice
+#   POST /corrigir  {"valor": 100, "vencimento": "10/06/2020", "fim": "09/2025"}
+#   POST /lote      {"valores": [...], "vencimentos": [...], "fim": "09/2025"}
+#
+# Nas duas rotas POST o campo opcional "indice" ("igpm", "ipca", "inpc",
+# "selic", "tr") escolhe a série da correção monetária; o padrão é o IGP-M.
+import argparse
+import json
+import math
+import os
+import sys
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pandas as pd
+from calculos import (
+    METODOS_LOTE, calcular_lote, calcular_tres_metodos, carregar_tabela_fatores, carregar_tabela_indice,
+    indices_disponiveis, ordinal_mes_texto,
+)
+
+DATA_FIM_PADRAO = "09/2025"
+LIMITE_LOTE_LOCAL = 50_000   # lotes maiores vão para o pool de processos
+TAMANHO_MAX_CORPO = 256 * 2**20
+
+# ----------------------------
+# Cálculo
+# ----------------------------
+def _converter_datas(vencimentos):
+    """Aceita "DD/MM/AAAA" ou ISO ("AAAA-MM-DD"); ValueError se não reconhecer."""
+    # exact=False aceita o ISO com hora ("AAAA-MM-DDTHH:MM") e funciona no
+    # pandas 1.5, que não tem format="ISO8601"; só o mês importa no cálculo
+    iso = not (vencimentos and "/" in str(vencimentos[0]))
+    try:
+        return pd.to_datetime(pd.Series(vencimentos, dtype=object),
+                              format="%Y-%m-%d" if iso else "%d/%m/%Y", exact=not iso)
+    except (ValueError, TypeError):
+        raise ValueError("Data de vencimento inválida. Use DD/MM/AAAA ou AAAA-MM-DD.")
+
+def _converter_data(vencimento):
+    """Versão de _converter_datas para uma data só, sem passar pelo pandas."""
+    try:
+        if "/" in str(vencimento):
+            return datetime.strptime(str(vencimento), "%d/%m/%Y")
+        return datetime.fromisoformat(str(vencimento))
+    except ValueError:
+        raise ValueError("Data de vencimento inválida. Use DD/MM/AAAA ou AAAA-MM-DD.")
+
+def _valor(valor):
+    """float do campo valor; ValueError se não for um número finito."""
+    valor = float(valor)
+    if not math.isfinite(valor):
+        raise ValueError("Valor inválido: use um número finito.")
+    return valor
+
+def _sem_nan(valores):
+    return [None if isinstance(v, float) and math.isnan(v) else v for v in valores]
+
+def corrigir_lote(valores, vencimentos, data_fim_str, tabela):
+    """Três métodos para um lote; roda tanto no processo principal quanto no pool."""
+    resultado = calcular_lote(valores, _converter_datas(vencimentos), data_fim_str, tabela)
+    return {metodo: _sem_nan(resultado[metodo].tolist()) for metodo in METODOS_LOTE}
+
+# ----------------------------
+# Servidor
+# ----------------------------
+class ServidorCalculos(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, endereco, processos=0):
+        super().__init__(endereco, TratadorCalculos)
+        # spawn: fork a partir de um servidor com várias threads pode herdar travas presas
+        self.pool = ProcessPoolExecutor(processos, mp_context=get_context("spawn")) if processos > 0 else None
+
+    def server_close(self):
+        super().server_close()
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+
+class ErroRequisicao(Exception):
+    pass
+
+class TratadorCalculos(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # mantém a conexão aberta entre requisições
+    disable_nagle_algorithm = True  # cabeçalho e corpo saem sem esperar o ACK
+
+    def do_GET(self):
+        if self.path != "/saude":
+            return self._responder(404, {"erro": "Rota não encontrada."})
+        tabela = carregar_tabela_fatores()
+        self._responder(200, {
+            "status": "ok",
+            "indice_inicio": ordinal_mes_texto(tabela.ordinal_inicial),
+            "indice_fim": ordinal_mes_texto(tabela.ordinal_final),
+            "indices": indices_disponiveis(),
+        })
+
+    def do_POST(self):
+        rotas = {"/corrigir": self._corrigir, "/lote": self._lote}
+        if self.path not in rotas:
+            self.close_connection = True  # o corpo não foi lido: a conexão não pode ser reaproveitada
+            return self._responder(404, {"erro": "Rota não encontrada."})
+        try:
+            self._responder(200, rotas[self.path](self._ler_json()))
+        except KeyError as e:
+            self._responder(400, {"erro": f"Campo obrigatório ausente: {e}"})
+        except (ErroRequisicao, ValueError, TypeError) as e:
+            self._responder(400, {"erro": str(e)})
+        except OSError:
+            # a mensagem do sistema traz caminhos do servidor: não vai para o cliente
+            self._responder(500, {"erro": "Falha ao ler os arquivos de índice do servidor."})
+        except Exception as e:
+            self._responder(500, {"erro": f"Falha no cálculo: {e}"})
+
+    def _corrigir(self, corpo):
+        tabela = carregar_tabela_indice(corpo.get("indice", "igpm"))
+        valor = None if corpo["valor"] is None else _valor(corpo["valor"])
+        vencimento = None if corpo["vencimento"] is None else _converter_data(corpo["vencimento"])
+        resultado = calcular_tres_metodos(valor, vencimento, corpo.get("fim", DATA_FIM_PADRAO), tabela)
+        return dict(zip(METODOS_LOTE, _sem_nan(resultado)))
+
+    def _lote(self, corpo):
+        valores, vencimentos = corpo["valores"], corpo["vencimentos"]
+        if len(valores) != len(vencimentos):
+            raise ErroRequisicao("'valores' e 'vencimentos' devem ter o mesmo tamanho.")
+        if any(isinstance(v, float) and not math.isfinite(v) for v in valores):
+            raise ErroRequisicao("Valor inválido: use números finitos.")
+        tabela = carregar_tabela_indice(corpo.get("indice", "igpm"))
+        args = (valores, vencimentos, corpo.get("fim", DATA_FIM_PADRAO), tabela)
+        if self.server.pool is not None and len(valores) > LIMITE_LOTE_LOCAL:
+            return self.server.pool.submit(corrigir_lote, *args).result()
+        return corrigir_lote(*args)
+
+    def _ler_json(self):
+        # Sem ler o corpo inteiro, o que sobrou dele seria lido como a próxima
+        # requisição da conexão keep-alive: nesses casos a conexão é fechada.
+        try:
+            tamanho = int(self.headers.get("Content-Length"))
+        except (TypeError, ValueError):
+            tamanho = -1
+        if tamanho < 0:
+            self.close_connection = True
+            raise ErroRequisicao("Content-Length ausente ou inválido.")
+        if tamanho > TAMANHO_MAX_CORPO:
+            self.close_connection = True
+            raise ErroRequisicao("Requisição grande demais.")
+        try:
+            corpo = json.loads(self.rfile.read(tamanho) or b"{}")
+        except json.JSONDecodeError as e:
+            raise ErroRequisicao(f"JSON inválido: {e}")
+        if not isinstance(corpo, dict):
+            raise ErroRequisicao("O corpo da requisição deve ser um objeto JSON.")
+        return corpo
+
+    def _responder(self, status, dados):
+        corpo = json.dumps(dados, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(corpo)))
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, formato, *args):
+        pass  # sem log por requisição; em centenas de req/s ele domina o tempo
+
+# ----------------------------
+# Executar
+# ----------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="API HTTP/JSON dos cálculos da SEMAE.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8000)
+    parser.add_argument("--processos", type=int, default=os.cpu_count() or 1,
+                        help=f"processos para lotes acima de {LIMITE_LOTE_LOCAL} faturas; 0 = sem pool")
+    args = parser.parse_args(argv)
+
+    carregar_tabela_fatores()  # deixa o índice em memória antes da primeira requisição
+    servidor = ServidorCalculos((args.host, args.porta), args.processos)
+    print(f"Servindo em http://{args.host}:{args.porta}", file=sys.stderr)
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
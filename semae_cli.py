@@ -0,0 +1,111 @@
+# semae_cli.py
+# Correção das contas pela linha de comando (sem Tkinter/Streamlit).
+import argparse
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from calculos import (
+    CONTAS_PATH, METODOS, carregar_tabela_indice, corrigir_contas, formatar_brasileiro, indices_disponiveis,
+    ler_contas_em_blocos, limpar_contas, ordinal_mes_fim,
+)
+
+# ----------------------------
+# Processamento em blocos (um ou vários processos)
+# ----------------------------
+# Tabela de fatores do processo trabalhador, recebida uma única vez na
+# inicialização do pool em vez de acompanhar cada bloco.
+_tabela_trabalhador = None
+
+def _iniciar_trabalhador(tabela):
+    global _tabela_trabalhador
+    _tabela_trabalhador = tabela
+
+def _processar_bloco(bloco, data_fim_str, metodos):
+    """Limpa, corrige e formata um bloco bruto; devolve (linhas CSV, nº de contas)."""
+    bloco = limpar_contas(bloco).dropna(subset=["vencimento", "valor"])
+    if bloco.empty:
+        return "", 0
+    saida = formatar_brasileiro(corrigir_contas(bloco, data_fim_str, metodos, _tabela_trabalhador))
+    return saida.to_csv(index=False, sep=";", header=False), len(saida)
+
+def corrigir_arquivo(entrada, destino, data_fim_str, metodos=tuple(METODOS), tamanho_bloco=100_000, processos=1,
+                     indice="igpm"):
+    """
+    Corrige o arquivo bloco a bloco, gravando cada bloco assim que fica pronto.
+
+    Com processos > 1 os blocos são distribuídos num ProcessPoolExecutor e
+    gravados na ordem original; no máximo 2 blocos por processo ficam em
+    andamento, então a memória continua limitada por tamanho_bloco.
+    indice escolhe a série de correção no registro de calculos.INDICES.
+    Métodos repetidos contam uma vez só, na ordem em que aparecem.
+    Retorna o número de contas gravadas.
+    """
+    metodos = tuple(dict.fromkeys(metodos))  # o cabeçalho tem de bater com as colunas de cada linha
+    tabela = carregar_tabela_indice(indice)  # cache binário: sem reler o CSV do índice
+    ordinal_mes_fim(data_fim_str)  # valida antes de abrir o pool
+    colunas = ["competencia", "vencimento", "valor"] + [METODOS[m] for m in metodos]
+    destino.write(";".join(colunas) + "\n")
+    blocos = ler_contas_em_blocos(entrada, tamanho_bloco, limpar=False)
+
+    total = 0
+    if processos <= 1:
+        _iniciar_trabalhador(tabela)
+        for bloco in blocos:
+            linhas, n = _processar_bloco(bloco, data_fim_str, metodos)
+            destino.write(linhas)
+            total += n
+        return total
+
+    pendentes = deque()
+    with ProcessPoolExecutor(processos, initializer=_iniciar_trabalhador, initargs=(tabela,)) as pool:
+        for bloco in blocos:
+            pendentes.append(pool.submit(_processar_bloco, bloco, data_fim_str, metodos))
+            if len(pendentes) >= 2 * processos:
+                linhas, n = pendentes.popleft().result()
+                destino.write(linhas)
+                total += n
+        while pendentes:
+            linhas, n = pendentes.popleft().result()
+            destino.write(linhas)
+            total += n
+    return total
+
+# ----------------------------
+# Executar
+# ----------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Corrige as contas da SEMAE pelos três métodos.")
+    parser.add_argument("entrada", nargs="?", default=CONTAS_PATH,
+                        help="arquivo no formato do CONTASFORMATADAS.csv")
+    parser.add_argument("-s", "--saida", default="-",
+                        help="arquivo CSV de saída (padrão: saída padrão)")
+    parser.add_argument("-f", "--fim", default="09/2025",
+                        help="mês final da correção, MM/AAAA (padrão: 09/2025)")
+    parser.add_argument("-m", "--metodo", action="append", choices=list(METODOS),
+                        help="método a aplicar; pode repetir (padrão: os três)")
+    parser.add_argument("-i", "--indice", default="igpm", choices=indices_disponiveis(),
+                        help="índice de correção monetária, entre os que têm arquivo (padrão: igpm)")
+    parser.add_argument("-b", "--bloco", type=int, default=100_000,
+                        help="contas lidas por bloco (padrão: 100000)")
+    parser.add_argument("-p", "--processos", type=int, default=1,
+                        help=f"processos em paralelo; 0 = todos os núcleos ({os.cpu_count()})")
+    args = parser.parse_args(argv)
+    metodos = args.metodo or tuple(METODOS)
+    processos = args.processos or os.cpu_count() or 1
+
+    try:
+        if args.saida == "-":
+            total = corrigir_arquivo(args.entrada, sys.stdout, args.fim, metodos, args.bloco, processos, args.indice)
+        else:
+            with open(args.saida, "w", encoding="utf-8", newline="") as destino:
+                total = corrigir_arquivo(args.entrada, destino, args.fim, metodos, args.bloco, processos, args.indice)
+    except (OSError, ValueError) as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 1
+
+    print(f"{total} contas corrigidas até {args.fim}.", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
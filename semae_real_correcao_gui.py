@@ -416,14 +416,14 @@ if __name__ == "__main__":
 import pandas as pd
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog, scrolledtext
-import os
+from calculos import carregar_dados, construir_tabela_fatores, gravar_csv_brasileiro, processar_contas_colunar
+from tabela_virtual import TabelaVirtual, formatar_datas, formatar_reais, formatar_texto
+from tarefas_gui import PainelTarefa, em_blocos
 
 # ----------------------------
 # Configurações (até setembro/2025)
 # ----------------------------
 DATA_FIM = pd.to_datetime("2025-09-30")  # Correção até set/2025
-TAXA_JUROS_REAL = 0.002345  # 0,2345% ao mês (calibrado com cda.csv)
-TAXA_MULTA = 0.02           # 2%
 
 METODOLOGIA = """
 Cálculo baseado na metodologia real da CDA 0000510/2023 da SEMAE, 
@@ -451,77 +451,15 @@ conforme o que pudemos apurar na CDA 0000510/2023
 # ----------------------------
 # Carregar dados
 # ----------------------------
-def carregar_dados():
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    contas_path = os.path.join(script_dir, "CONTASFORMATADAS.csv")
-    indices_path = os.path.join(script_dir, "indice.csv")
-
-    # Contas
-    contas = pd.read_csv(contas_path, sep=",", quotechar='"', decimal=",")
-    contas = contas.dropna(subset=["competencia", "vencimento", "valor"])
-    # Remove linha espúria no final ("3.308,39")
-    contas = contas[contas["competencia"].str.match(r"\d{2}/\d{4}", na=False)]
-    contas["valor"] = (
-        contas["valor"]
-        .astype(str)
-        .str.replace(".", "", regex=False)
-        .str.replace(",", ".", regex=False)
-        .astype(float)
-    )
-    contas["vencimento"] = pd.to_datetime(contas["vencimento"], dayfirst=True, errors="coerce")
-    contas = contas.dropna(subset=["vencimento", "valor"])
-
-    # Índices
-    igpm = pd.read_csv(indices_path, sep=",", quotechar='"', decimal=",")
-    igpm["Data"] = pd.to_datetime(igpm["Data"], format="%m/%Y")
-    igpm = igpm.set_index("Data").sort_index()
-    igpm["fator"] = 1 + igpm["Indice"] / 100.0
-
-    return contas, igpm
+def carregar_contas_validas():
+    contas, igpm = carregar_dados()
+    return contas.dropna(subset=["vencimento", "valor"]), igpm
 
 # ----------------------------
 # Cálculo
 # ----------------------------
-def calcular_meses(vencimento):
-    inicio = vencimento.to_period("M") + 1
-    fim = DATA_FIM.to_period("M")
-    return max(0, (fim - inicio).n + 1)
-
-def aplicar_correcao_igpm(valor, vencimento, igpm_series):
-    inicio = (vencimento + pd.DateOffset(days=1)).to_period("M")
-    fim = DATA_FIM.to_period("M")
-    if inicio > fim:
-        return 0.0
-    dt_inicio = inicio.start_time
-    dt_fim = fim.end_time
-    fatores = igpm_series.loc[dt_inicio:dt_fim]
-    fator_acum = fatores.prod() if not fatores.empty else 1.0
-    return valor * (fator_acum - 1)
-
 def processar_contas(contas, igpm):
-    resultados = []
-    igpm_fatores = igpm["fator"]
-    for _, row in contas.iterrows():
-        venc = row["vencimento"]
-        valor_orig = row["valor"]
-
-        correcao = aplicar_correcao_igpm(valor_orig, venc, igpm_fatores)
-        valor_corrigido = valor_orig + correcao
-        multa = valor_corrigido * TAXA_MULTA
-        n_meses = calcular_meses(venc)
-        juros = valor_corrigido * TAXA_JUROS_REAL * n_meses
-        total = valor_corrigido + multa + juros
-
-        resultados.append({
-            "competencia": row["competencia"],
-            "vencimento": venc,
-            "valor_original": round(valor_orig, 2),
-            "correcao_igpm": round(correcao, 2),
-            "multa_2pct": round(multa, 2),
-            "juros_real": round(juros, 2),
-            "total_semae_real": round(total, 2)
-        })
-    return pd.DataFrame(resultados)
+    return processar_contas_colunar(contas, construir_tabela_fatores(igpm), DATA_FIM, "real")
 
 # ----------------------------
 # Interface gráfica
@@ -533,7 +471,7 @@ class SEMAERealApp:
         self.root.geometry("1050x620")
 
         try:
-            self.contas, self.igpm = carregar_dados()
+            self.contas, self.igpm = carregar_contas_validas()
         except Exception as e:
             messagebox.showerror("Erro", f"Erro ao carregar arquivos:\n{e}")
             root.destroy()
@@ -547,49 +485,44 @@ class SEMAERealApp:
         ttk.Button(frame_ctrl, text="Exportar CSV", command=self.exportar).pack(side="left", padx=5)
         ttk.Button(frame_ctrl, text="Como foi calculado?", command=self.mostrar_metodologia).pack(side="left", padx=5)
 
+        self.painel = PainelTarefa(root)
+        self.painel.pack(padx=10, fill="x")
+
         frame_table = ttk.Frame(root)
         frame_table.pack(fill="both", expand=True, padx=10, pady=10)
         cols = ("competencia", "vencimento", "valor_original", "correcao_igpm", "multa_2pct", "juros_real", "total_semae_real")
-        self.tree = ttk.Treeview(frame_table, columns=cols, show="headings")
         headings = ["Competência", "Vencimento", "Valor Original", "Correção IGP-M", "Multa (2%)", "Juros", "Total SEMAE"]
-        for col, txt in zip(cols, headings):
-            self.tree.heading(col, text=txt)
-            self.tree.column(col, width=120, anchor="center")
-        self.tree.pack(side="left", fill="both", expand=True)
-        scrollbar = ttk.Scrollbar(frame_table, orient="vertical", command=self.tree.yview)
-        scrollbar.pack(side="right", fill="y")
-        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tabela = TabelaVirtual(frame_table, cols, headings)
+        self.tabela.pack(fill="both", expand=True)
 
         self.carregar_tabela()
 
     def carregar_tabela(self):
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        for _, row in self.contas.iterrows():
-            venc = row["vencimento"].strftime("%d/%m/%Y")
-            self.tree.insert("", "end", values=(row["competencia"], venc, f"R$ {row['valor']:.2f}", "", "", "", ""))
+        self.tabela.carregar({
+            "competencia": formatar_texto(self.contas["competencia"]),
+            "vencimento": formatar_datas(self.contas["vencimento"]),
+            "valor_original": formatar_reais(self.contas["valor"]),
+        })
 
     def calcular(self):
-        try:
-            self.df_resultado = processar_contas(self.contas, self.igpm)
-            self.atualizar_tabela()
+        # cálculo e formatação na thread da tarefa; a janela só recebe o pronto
+        def trabalhar(tarefa):
+            df = em_blocos(tarefa, self.contas, lambda bloco: processar_contas(bloco, self.igpm), ignore_index=True)
+            return df, self.colunas_tabela(df)
+
+        def concluir(resultado):
+            self.df_resultado, colunas = resultado
+            self.tabela.carregar(colunas)
             messagebox.showinfo("Sucesso", "Cálculo concluído até 30/09/2025.")
-        except Exception as e:
-            messagebox.showerror("Erro", f"Falha no cálculo:\n{e}")
 
-    def atualizar_tabela(self):
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        for _, row in self.df_resultado.iterrows():
-            self.tree.insert("", "end", values=(
-                row["competencia"],
-                row["vencimento"].strftime("%d/%m/%Y"),
-                f"R$ {row['valor_original']:.2f}",
-                f"R$ {row['correcao_igpm']:.2f}",
-                f"R$ {row['multa_2pct']:.2f}",
-                f"R$ {row['juros_real']:.2f}",
-                f"R$ {row['total_semae_real']:.2f}"
-            ))
+        self.painel.executar("Calculando", trabalhar, concluir, "Falha no cálculo")
+
+    def colunas_tabela(self, df):
+        return {
+            "competencia": formatar_texto(df["competencia"]),
+            "vencimento": formatar_datas(df["vencimento"]),
+            **{col: formatar_reais(df[col]) for col in self.tabela.colunas[2:]},
+        }
 
     def exportar(self):
         if self.df_resultado is None:
@@ -604,12 +537,13 @@ class SEMAERealApp:
         if not path:
             return
 
-        df_exp = self.df_resultado.copy()
-        for col in ["valor_original", "correcao_igpm", "multa_2pct", "juros_real", "total_semae_real"]:
-            df_exp[col] = df_exp[col].map(lambda x: f"{x:.2f}".replace(".", ","))
-        df_exp["vencimento"] = df_exp["vencimento"].dt.strftime("%d/%m/%Y")
-        df_exp.to_csv(path, index=False, sep=";", decimal=",")
-        messagebox.showinfo("Sucesso", f"Arquivo salvo:\n{path}")
+        def trabalhar(tarefa):
+            return gravar_csv_brasileiro(self.df_resultado, path, progresso=tarefa.progresso)
+
+        self.painel.executar(
+            "Exportando", trabalhar,
+            lambda caminho: messagebox.showinfo("Sucesso", f"Arquivo salvo:\n{caminho}"), "Falha ao exportar"
+        )
 
     def mostrar_metodologia(self):
         top = tk.Toplevel(self.root)
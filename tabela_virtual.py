@@ -0,0 +1,193 @@
+# tabela_virtual.py
+# Tabela virtual para as interfaces Tkinter: o Treeview só tem as linhas que
+# cabem na tela, e rolar troca os textos dessas linhas em vez de criar itens.
+from tkinter import ttk
+
+import numpy as np
+import pandas as pd
+
+# ----------------------------
+# Formatação em coluna
+# ----------------------------
+def formatar_reais(valores):
+    """Coluna de valores como "R$ 1234.56" (vazio onde não há valor)."""
+    valores = np.asarray(valores, dtype=float)
+    textos = np.array([f"R$ {v:.2f}" for v in valores.tolist()], dtype=object)
+    textos[np.isnan(valores)] = ""
+    return textos
+
+def formatar_datas(datas):
+    """Coluna de datas como "DD/MM/AAAA" (vazio onde não há data)."""
+    # as datas se repetem muito: formata cada data distinta uma vez só
+    codigos, distintas = pd.factorize(pd.DatetimeIndex(datas))
+    textos = np.append(np.asarray(distintas.strftime("%d/%m/%Y"), dtype=object), "")
+    return textos[codigos]  # código -1 (NaT) cai no "" do fim
+
+def formatar_texto(valores):
+    """Coluna qualquer como texto (vazio onde não há valor)."""
+    return np.asarray(pd.Series(valores).fillna("").astype(str), dtype=object)
+
+# ----------------------------
+# Tabela
+# ----------------------------
+class TabelaVirtual(ttk.Frame):
+    """
+    Treeview com rolagem virtual sobre colunas já formatadas.
+
+    carregar() recebe um dicionário coluna -> sequência de textos (todas do
+    mesmo tamanho; colunas ausentes ficam vazias). Só existem no Treeview as
+    linhas visíveis mais `folga` linhas; ao rolar, os itens são reaproveitados
+    com os textos da nova janela. linha_selecionada() devolve a posição da
+    linha nos dados carregados, não o item do Treeview.
+    """
+    def __init__(self, master, colunas, titulos, largura=120, folga=2):
+        super().__init__(master)
+        self.colunas = tuple(colunas)
+        self.folga = folga
+        self._dados = {}
+        self._n = 0
+        self._inicio = 0
+        self._visiveis = 1
+        self._selecionada = None
+
+        self.tree = ttk.Treeview(self, columns=self.colunas, show="headings", selectmode="browse")
+        for col, txt in zip(self.colunas, titulos):
+            self.tree.heading(col, text=txt)
+            self.tree.column(col, width=largura, anchor="center")
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._rolar_barra)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.tree.bind("<Configure>", lambda e: self._ajustar_altura())
+        self.tree.bind("<MouseWheel>", self._rolar_roda)
+        self.tree.bind("<Button-4>", lambda e: self._rolar(-3))
+        self.tree.bind("<Button-5>", lambda e: self._rolar(3))
+        self.tree.bind("<Up>", lambda e: self._mover_selecao(-1))
+        self.tree.bind("<Down>", lambda e: self._mover_selecao(1))
+        self.tree.bind("<Prior>", lambda e: self._mover_selecao(-self._visiveis))
+        self.tree.bind("<Next>", lambda e: self._mover_selecao(self._visiveis))
+        self.tree.bind("<Home>", lambda e: self._mover_selecao(-self._n))
+        self.tree.bind("<End>", lambda e: self._mover_selecao(self._n))
+        self.tree.bind("<<TreeviewSelect>>", self._ao_selecionar)
+
+    def __len__(self):
+        return self._n
+
+    def carregar(self, colunas):
+        """Troca os dados exibidos; nenhuma linha é criada além da janela visível."""
+        n = len(next(iter(colunas.values()))) if colunas else 0
+        vazia = np.full(n, "", dtype=object)
+        self._dados = {col: np.asarray(colunas[col], dtype=object) if col in colunas else vazia
+                       for col in self.colunas}
+        self._n = n
+        self._inicio = 0
+        self._selecionada = None
+        self._renderizar()
+        self._ajustar_altura()
+
+    def linha_selecionada(self):
+        return self._selecionada
+
+    def valores_linha(self, linha):
+        return tuple(self._dados[col][linha] for col in self.colunas)
+
+    # --- janela visível ---
+    def _altura_linha(self):
+        return int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+
+    def _linhas_que_cabem(self):
+        """
+        Linhas que o Treeview mostra inteiras, medidas nas próprias linhas.
+
+        A altura de verdade depende da fonte e do tema, não só do rowheight
+        do estilo, e o Treeview só dá bbox às linhas que mostra. None enquanto
+        nenhuma linha aparece (tabela vazia ou ainda não desenhada).
+        """
+        self.tree.update_idletasks()
+        itens = self.tree.get_children()
+        caixa = self.tree.bbox(itens[0]) if itens else ""
+        if not caixa:
+            return None
+        mostradas = sum(1 for item in itens if self.tree.bbox(item))
+        if mostradas < len(itens):
+            return mostradas
+        # todas as linhas criadas aparecem: mede o espaço abaixo do cabeçalho
+        _, topo, _, altura = caixa
+        return (self.tree.winfo_height() - topo) // altura
+
+    def _ajustar_altura(self):
+        # a segunda medida já conta com as linhas criadas pela primeira
+        for _ in range(2):
+            visiveis = self._linhas_que_cabem()
+            if visiveis is None:
+                # estimativa: o cabeçalho tem mais ou menos a altura de uma linha
+                visiveis = self.tree.winfo_height() // self._altura_linha() - 1
+            visiveis = max(1, visiveis)
+            if visiveis == self._visiveis:
+                return
+            self._visiveis = visiveis
+            self._renderizar()
+
+    def _renderizar(self):
+        self._inicio = max(0, min(self._inicio, self._n - self._visiveis))
+        fim = min(self._n, self._inicio + self._visiveis + self.folga)
+        itens = self.tree.get_children()
+        faltam = fim - self._inicio - len(itens)
+        if faltam > 0:
+            itens += tuple(self.tree.insert("", "end") for _ in range(faltam))
+        elif faltam < 0:
+            self.tree.delete(*itens[faltam:])
+            itens = itens[:faltam]
+        for item, linha in zip(itens, range(self._inicio, fim)):
+            self.tree.item(item, values=self.valores_linha(linha))
+
+        # a seleção acompanha a linha dos dados, não o item reaproveitado
+        if self._selecionada is not None and self._inicio <= self._selecionada < fim:
+            item = itens[self._selecionada - self._inicio]
+            self.tree.selection_set(item)
+            self.tree.focus(item)
+        else:
+            self.tree.selection_set(())
+        self.tree.yview_moveto(0)
+
+        if self._n:
+            self.scrollbar.set(self._inicio / self._n, min(1.0, (self._inicio + self._visiveis) / self._n))
+        else:
+            self.scrollbar.set(0, 1)
+
+    # --- rolagem ---
+    def _rolar(self, linhas):
+        self._inicio += linhas
+        self._renderizar()
+        return "break"  # o Treeview não rola sozinho: a janela é nossa
+
+    def _rolar_barra(self, acao, quantidade, unidade=None):
+        if acao == "moveto":
+            self._inicio = int(float(quantidade) * self._n)
+            self._renderizar()
+        elif acao == "scroll":
+            passo = self._visiveis if unidade == "pages" else 1
+            self._rolar(int(quantidade) * passo)
+
+    def _rolar_roda(self, evento):
+        # Windows manda múltiplos de 120; no macOS o delta já vem em linhas
+        passos = evento.delta // 120 if abs(evento.delta) >= 120 else evento.delta
+        return self._rolar(-3 * passos)
+
+    # --- seleção ---
+    def _ao_selecionar(self, _evento):
+        selecao = self.tree.selection()
+        if selecao:
+            self._selecionada = self._inicio + self.tree.index(selecao[0])
+
+    def _mover_selecao(self, passo):
+        if not self._n:
+            return "break"
+        atual = self._inicio if self._selecionada is None else self._selecionada
+        self._selecionada = max(0, min(self._n - 1, atual + passo))
+        if self._selecionada < self._inicio:
+            self._inicio = self._selecionada
+        elif self._selecionada >= self._inicio + self._visiveis:
+            self._inicio = self._selecionada - self._visiveis + 1
+        self._renderizar()
+        return "break"
@@ -0,0 +1,140 @@
+# tarefas_gui.py
+# Cálculos e exportações das interfaces Tkinter em segundo plano: a tarefa
+# roda numa thread, manda o progresso por uma fila e a janela lê essa fila
+# com root.after, então a tabela continua navegável durante o processamento.
+import queue
+import threading
+from tkinter import ttk, messagebox
+
+import pandas as pd
+
+class TarefaCancelada(Exception):
+    """Levantada dentro da tarefa quando o operador pede o cancelamento."""
+
+class Tarefa:
+    """
+    Lado da thread trabalhadora.
+
+    A função da tarefa recebe este objeto e chama progresso() entre um bloco
+    e outro; se o cancelamento foi pedido, progresso() (ou verificar())
+    levanta TarefaCancelada e a tarefa termina ali. Nada aqui toca no Tk.
+    """
+    def __init__(self):
+        self.fila = queue.Queue()
+        self._cancelar = threading.Event()
+
+    def progresso(self, feito, total):
+        self.verificar()
+        self.fila.put(("progresso", feito, total))
+
+    def verificar(self):
+        if self._cancelar.is_set():
+            raise TarefaCancelada()
+
+    def cancelar(self):
+        self._cancelar.set()
+
+# ----------------------------
+# Trabalho em blocos
+# ----------------------------
+TAMANHO_BLOCO = 50_000
+
+def em_blocos(tarefa, dados, funcao, tamanho_bloco=TAMANHO_BLOCO, ignore_index=False):
+    """
+    funcao(bloco) para cada fatia de `dados`, com progresso e cancelamento.
+
+    Os cálculos são linha a linha, então juntar os blocos dá o mesmo
+    resultado de uma chamada só.
+    """
+    total = len(dados)
+    partes = []
+    for inicio in range(0, total, tamanho_bloco):
+        partes.append(funcao(dados.iloc[inicio:inicio + tamanho_bloco]))
+        tarefa.progresso(min(inicio + tamanho_bloco, total), total)
+    if not partes:
+        return funcao(dados)
+    return pd.concat(partes, ignore_index=ignore_index)
+
+# ----------------------------
+# Painel na janela
+# ----------------------------
+class PainelTarefa(ttk.Frame):
+    """
+    Barra de progresso, situação e botão "Cancelar" de uma janela.
+
+    executar() dispara uma tarefa por vez; ao_concluir(resultado) roda na
+    thread do Tk quando ela termina bem. Erros viram uma caixa de mensagem.
+    """
+    INTERVALO_MS = 100
+
+    def __init__(self, master):
+        super().__init__(master)
+        self.barra = ttk.Progressbar(self, mode="determinate", length=240)
+        self.barra.pack(side="left", padx=5)
+        self.situacao = ttk.Label(self, text="")
+        self.situacao.pack(side="left", padx=5)
+        self.botao_cancelar = ttk.Button(self, text="Cancelar", command=self.cancelar, state="disabled")
+        self.botao_cancelar.pack(side="left", padx=5)
+        self._tarefa = None
+
+    @property
+    def ocupado(self):
+        return self._tarefa is not None
+
+    def executar(self, descricao, funcao, ao_concluir, mensagem_erro="Falha"):
+        if self.ocupado:
+            messagebox.showwarning("Atenção", "Aguarde o término da tarefa em andamento ou cancele-a.")
+            return False
+        tarefa = Tarefa()
+
+        def trabalhar():
+            try:
+                tarefa.fila.put(("fim", funcao(tarefa)))
+            except TarefaCancelada:
+                tarefa.fila.put(("cancelada",))
+            except Exception as e:
+                tarefa.fila.put(("erro", e))
+
+        self._tarefa = tarefa
+        self._descricao = descricao
+        self._ao_concluir = ao_concluir
+        self._mensagem_erro = mensagem_erro
+        self.barra.configure(value=0, maximum=1)
+        self.situacao.configure(text=f"{descricao}...")
+        self.botao_cancelar.configure(state="normal")
+        threading.Thread(target=trabalhar, daemon=True).start()
+        self.after(self.INTERVALO_MS, self._acompanhar)
+        return True
+
+    def cancelar(self):
+        if self._tarefa is not None:
+            self._tarefa.cancelar()
+            self.situacao.configure(text="Cancelando...")
+
+    def _acompanhar(self):
+        tarefa = self._tarefa
+        try:
+            while True:
+                mensagem = tarefa.fila.get_nowait()
+                if mensagem[0] == "progresso":
+                    _, feito, total = mensagem
+                    self.barra.configure(value=feito, maximum=max(total, 1))
+                    self.situacao.configure(text=f"{self._descricao}: {feito:,} de {total:,}".replace(",", "."))
+                    continue
+                self._encerrar(mensagem)
+                return
+        except queue.Empty:
+            self.after(self.INTERVALO_MS, self._acompanhar)
+
+    def _encerrar(self, mensagem):
+        self._tarefa = None
+        self.botao_cancelar.configure(state="disabled")
+        self.barra.configure(value=0)
+        if mensagem[0] == "fim":
+            self.situacao.configure(text="")
+            self._ao_concluir(mensagem[1])
+        elif mensagem[0] == "cancelada":
+            self.situacao.configure(text=f"{self._descricao}: cancelado.")
+        else:
+            self.situacao.configure(text="")
+            messagebox.showerror("Erro", f"{self._mensagem_erro}:\n{mensagem[1]}")
@@ -0,0 +1,259 @@
+# verificar_calculos.py
+# Confere que os caminhos de cálculo que deveriam coincidir dão o mesmo
+# centavo, inclusive nos empates de meio centavo: funções escalares contra o
+# cálculo em lote e contra o motor colunar das interfaces; cenários, carteira
+# incremental e demonstrativos contra o cálculo mês a mês. Sai com código 1
+# se algum caso divergir.
+#
+#   python verificar_calculos.py [verificação ...]
+import argparse
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+import calculos
+
+DATA_FIM = "09/2025"
+# vencimentos antes e depois do mês final (sem meses a corrigir) e no limite
+VENCIMENTOS = pd.to_datetime(["2014-03-10", "2019-12-31", "2025-07-05", "2025-08-10", "2025-09-30", "2025-11-10"])
+
+def valores_teste():
+    """Todos os centavos de 0,01 a 200,00 e uma amostra de valores maiores."""
+    rng = np.random.default_rng(0)
+    centavos = np.concatenate([np.arange(1, 20_001), rng.integers(20_001, 10_000_000, 5_000)])
+    return centavos / 100
+
+def _divergencias(nome, esperado, obtido, valores, vencimentos, tolerancia=0.0):
+    esperado = np.asarray(esperado, dtype=float)
+    obtido = np.asarray(obtido, dtype=float)
+    # a folga de 1e-6 absorve só o erro de representação dos centavos em float
+    proximos = esperado == obtido if not tolerancia else np.abs(esperado - obtido) <= tolerancia + 1e-6
+    iguais = proximos | (np.isnan(esperado) & np.isnan(obtido))
+    diferentes = np.flatnonzero(~iguais)
+    for i in diferentes[:5]:
+        vencimento = "-" if pd.isna(vencimentos[i]) else f"{vencimentos[i]:%d/%m/%Y}"
+        print(f"  {nome}: valor {valores[i]:.2f} venc. {vencimento}: "
+              f"esperado {esperado[i]:.2f}, obtido {obtido[i]:.2f}")
+    return len(diferentes)
+
+# ----------------------------
+# Verificações
+# ----------------------------
+def verificar_lote():
+    """Funções escalares (calculos.calcular_*) × calcular_lote."""
+    tabela = calculos.carregar_tabela_fatores()
+    base = valores_teste()
+    valores = np.tile(base, len(VENCIMENTOS))
+    vencimentos = VENCIMENTOS.repeat(len(base))
+    lote = calculos.calcular_lote(valores, vencimentos, DATA_FIM, tabela)
+    escalares = {
+        "igpm_puro": lambda v, d: calculos.calcular_igpm_puro(v, d, DATA_FIM, tabela),
+        "conforme_cda": lambda v, d: calculos.calcular_conforme_cda(v, d, DATA_FIM),
+        "pratica_real": lambda v, d: calculos.calcular_pratica_real(v, d, DATA_FIM, tabela),
+    }
+    pares = list(zip(valores.tolist(), vencimentos))
+    erros = 0
+    for metodo, funcao in escalares.items():
+        esperado = [funcao(v, d) for v, d in pares]
+        erros += _divergencias(metodo, esperado, lote[metodo], valores, vencimentos)
+    tres = np.array([calculos.calcular_tres_metodos(v, d, DATA_FIM, tabela) for v, d in pares])
+    for k, metodo in enumerate(calculos.METODOS_LOTE):
+        erros += _divergencias(f"calcular_tres_metodos/{metodo}", tres[:, k], lote[metodo], valores, vencimentos)
+    return erros
+
+def _conta_escalar(valor, vencimento, tabela, mes_fim, metodo):
+    """Uma conta como no laço original das interfaces (real ou cda), sem pandas."""
+    if pd.isna(valor) or pd.isna(vencimento):
+        return [valor, np.nan, np.nan, np.nan, np.nan]
+    correcao = valor * (tabela.fator_periodo(calculos.ordinal_mes(vencimento + pd.Timedelta(days=1)), mes_fim) - 1)
+    n_meses = max(0, mes_fim - calculos.ordinal_mes(vencimento))
+    if metodo == "real":
+        base = valor + correcao
+        multa, juros = base * calculos.TAXA_MULTA, base * calculos.TAXA_JUROS_REAL * n_meses
+        total = base + multa + juros
+    else:
+        multa, juros = valor * calculos.TAXA_MULTA, valor * calculos.TAXA_JUROS_DECLARADA * n_meses
+        total = valor + correcao + multa + juros
+    return [calculos.arredondar_centavos(x) for x in (valor, correcao, multa, juros, total)]
+
+def _contas_teste():
+    """Contas de valores_teste() em cada vencimento, mais contas sem vencimento ou valor."""
+    base = valores_teste()
+    contas = pd.DataFrame({
+        "competencia": "01/2020",
+        "vencimento": VENCIMENTOS.repeat(len(base)),
+        "valor": np.tile(base, len(VENCIMENTOS)),
+    })
+    # contas sem vencimento ou sem valor saem vazias, não com o mês zero
+    invalidas = pd.DataFrame({
+        "competencia": "01/2020",
+        "vencimento": pd.to_datetime([None, "2020-01-10", None]),
+        "valor": [100.0, np.nan, np.nan],
+    })
+    return pd.concat([contas, invalidas], ignore_index=True)
+
+def verificar_colunar():
+    """Laço conta a conta com as funções escalares × processar_contas_colunar."""
+    tabela = calculos.carregar_tabela_fatores()
+    data_fim = pd.Timestamp("2025-09-30")
+    mes_fim = calculos.ordinal_mes(data_fim)
+    contas = _contas_teste()
+    erros = 0
+    for metodo, (col_juros, col_total) in calculos.COLUNAS_METODO.items():
+        colunar = calculos.processar_contas_colunar(contas, tabela, data_fim, metodo)
+        esperado = np.array([_conta_escalar(v, d, tabela, mes_fim, metodo)
+                             for v, d in zip(contas["valor"].tolist(), contas["vencimento"])])
+        colunas = ["valor_original", "correcao_igpm", "multa_2pct", col_juros, col_total]
+        for k, col in enumerate(colunas):
+            erros += _divergencias(f"{metodo}/{col}", esperado[:, k], colunar[col],
+                                   contas["valor"].to_numpy(), contas["vencimento"])
+    return erros
+
+def verificar_centavos():
+    """
+    processar_contas_centavos × processar_contas_colunar.
+
+    Os motores arredondam em pontos diferentes, então cada parcela pode
+    diferir em um centavo e o total (soma das parcelas) em dois; as contas
+    vazias têm de ser as mesmas.
+    """
+    tabela = calculos.carregar_tabela_fatores()
+    data_fim = pd.Timestamp("2025-09-30")
+    contas = _contas_teste()
+    erros = 0
+    for metodo, (col_juros, col_total) in calculos.COLUNAS_METODO.items():
+        colunar = calculos.processar_contas_colunar(contas, tabela, data_fim, metodo)
+        centavos = calculos.processar_contas_centavos(contas, tabela, data_fim, metodo)
+        em_centavos = calculos.processar_contas_centavos(contas, tabela, data_fim, metodo, em_centavos=True)
+        for col in ["valor_original", "correcao_igpm", "multa_2pct", col_juros, col_total]:
+            tolerancia = 0.02 if col == col_total else 0.01
+            erros += _divergencias(f"{metodo}/{col}", colunar[col], centavos[col],
+                                   contas["valor"].to_numpy(), contas["vencimento"], tolerancia)
+            erros += _divergencias(f"{metodo}/{col} em centavos", centavos[col],
+                                   em_centavos[col].to_numpy(dtype=float, na_value=np.nan) / 100,
+                                   contas["valor"].to_numpy(), contas["vencimento"])
+    return erros
+
+def verificar_cenarios():
+    """calcular_cenarios × calcular_lote mês a mês, inclusive além do fim do índice."""
+    tabela = calculos.carregar_tabela_fatores()
+    contas = _contas_teste()
+    valores, vencimentos = contas["valor"].to_numpy(), contas["vencimento"]
+    erros = 0
+    for metodo in calculos.METODOS_LOTE:
+        cenarios = calculos.calcular_cenarios(valores, vencimentos, "01/2024", "12/2025", metodo, tabela)
+        for mes in cenarios.columns:
+            lote = calculos.calcular_lote(valores, vencimentos, mes, tabela)
+            erros += _divergencias(f"{mes}/{metodo}", lote[metodo], cenarios[mes], valores, vencimentos)
+    return erros
+
+def _demonstrativo_escalar(competencia, vencimento, valor, igpm, mes_fim_str):
+    """Linhas do demonstrativo de uma conta, com o laço mês a mês original das interfaces."""
+    if pd.isna(vencimento) or pd.isna(valor):
+        return []
+    mes_fim = pd.Period(mes_fim_str, freq="M")
+    mes_inicio = vencimento.to_period("M") + 1
+    if mes_inicio > mes_fim:
+        return [(competencia, "—", 0.0, 1.0, valor)]
+    fatores = igpm.loc[mes_inicio.start_time:mes_fim.end_time, "fator"]
+    if fatores.empty:
+        return [(competencia, "Sem índices", 0.0, 1.0, valor)]
+    linhas = []
+    valor_atual = valor
+    for data, fator in fatores.items():
+        valor_atual *= fator
+        linhas.append((competencia, data.strftime("%m/%Y"), round((fator - 1) * 100, 4),
+                       round(fator, 6), round(valor_atual, 2)))
+    return linhas
+
+# meses finais antes do índice ("Sem índices"), no meio, no fim e além dele
+MESES_DEMONSTRATIVO = ["06/2014", "01/2024", "09/2025", "12/2025"]
+
+def verificar_demonstrativos():
+    """Laço mês a mês conta a conta × gerar_demonstrativos, nas cinco colunas."""
+    igpm, _ = calculos.carregar_indice()
+    contas = _contas_teste()
+    # uma amostra: o laço de referência consulta o índice conta a conta
+    contas = contas.iloc[np.r_[0:len(contas) - 3:50, len(contas) - 3:len(contas)]]
+    contas.index = contas.index * 10  # rótulos que não coincidem com a posição
+    erros = 0
+    for mes in MESES_DEMONSTRATIVO:
+        linhas = [(rotulo, *linha)
+                  for rotulo, competencia, vencimento, valor in zip(contas.index, contas["competencia"],
+                                                                    contas["vencimento"], contas["valor"].to_numpy())
+                  for linha in _demonstrativo_escalar(competencia, vencimento, valor, igpm, mes)]
+        esperado = pd.DataFrame(linhas, columns=["conta", *calculos.COLUNAS_DEMONSTRATIVO])
+        obtido = calculos.gerar_demonstrativos(contas, igpm, mes)
+        if len(obtido) != len(esperado):
+            print(f"  {mes}: {len(esperado)} linhas esperadas, {len(obtido)} obtidas")
+            erros += 1
+            continue
+        valores = contas.loc[esperado["conta"], "valor"].to_numpy()
+        vencimentos = contas.loc[esperado["conta"], "vencimento"].to_numpy()
+        for col in ["conta", "Competência Original", "Mês de Correção"]:
+            diferentes = np.flatnonzero(esperado[col].to_numpy() != obtido[col].to_numpy())
+            for i in diferentes[:5]:
+                print(f"  {mes}/{col}: linha {i}: esperado {esperado[col].iat[i]!r}, obtido {obtido[col].iat[i]!r}")
+            erros += len(diferentes)
+        for col in ["Índice (%)", "Fator", "Valor Atualizado"]:
+            erros += _divergencias(f"{mes}/{col}", esperado[col], obtido[col], valores, pd.DatetimeIndex(vencimentos))
+    return erros
+
+# meses acrescentados a uma cópia do índice em verificar_carteira
+MESES_NOVOS = [("10/2025", "0,25"), ("11/2025", "-0,41"), ("12/2025", "1,07")]
+
+def verificar_carteira():
+    """
+    CarteiraCorrigida.avancar_mes × calcular_lote com a tabela relida do CSV.
+
+    Os meses de MESES_NOVOS são acrescentados a uma cópia temporária do
+    indice.csv com acrescentar_mes_indice; entre um mês e outro a carteira
+    passa por pickle, como quando é guardada de uma execução para a outra.
+    """
+    contas = _contas_teste()
+    valores, vencimentos = contas["valor"].to_numpy(), contas["vencimento"]
+    erros = 0
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "indice.csv")
+        shutil.copyfile(calculos.INDICE_PATH, caminho)
+        carteira = calculos.CarteiraCorrigida(valores, vencimentos, DATA_FIM, calculos.carregar_tabela_fatores(caminho))
+        for mes, indice_pct in MESES_NOVOS:
+            carteira = pickle.loads(pickle.dumps(carteira))
+            carteira.avancar_mes(calculos.acrescentar_mes_indice(mes, indice_pct, caminho))
+            lote = calculos.calcular_lote(valores, vencimentos, mes, calculos._ler_tabela_indice(caminho))
+            obtido = carteira.como_dataframe()
+            for metodo in calculos.METODOS_LOTE:
+                erros += _divergencias(f"{mes}/{metodo}", lote[metodo], obtido[metodo], valores, vencimentos)
+    return erros
+
+VERIFICACOES = {
+    "lote": verificar_lote,
+    "colunar": verificar_colunar,
+    "centavos": verificar_centavos,
+    "cenarios": verificar_cenarios,
+    "carteira": verificar_carteira,
+    "demonstrativos": verificar_demonstrativos,
+}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Confere a equivalência dos motores de cálculo.")
+    parser.add_argument("verificacoes", nargs="*",
+                        help=f"verificações a rodar (padrão: todas; opções: {', '.join(VERIFICACOES)})")
+    args = parser.parse_args(argv)
+    desconhecidas = set(args.verificacoes) - set(VERIFICACOES)
+    if desconhecidas:
+        parser.error(f"verificações desconhecidas: {', '.join(sorted(desconhecidas))}")
+    total = 0
+    for nome in args.verificacoes or VERIFICACOES:
+        erros = VERIFICACOES[nome]()
+        print(f"{nome:>14}: {'ok' if not erros else f'{erros} divergências'}")
+        total += erros
+    return 1 if total else 0
+
+if __name__ == "__main__":
+    sys.exit(main())